@@ -1,7 +1,21 @@
 import math
 import random
-import pgzrun
 import os
+import sys
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+# No modo de simulação o jogo roda sem janela e sem áudio
+MODO_SIMULACAO = '--simular' in sys.argv
+if MODO_SIMULACAO:
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pgzrun
+import pygame
+from pgzero.screen import Compositor, Screen
 
 
 # Verificar arquivos de áudio no início
@@ -31,16 +45,26 @@ verificar_arquivos_audio()
 
 # Constantes do jogo
 TAMANHO_GRADE = 32
+# O mundo pode ser maior que a área visível; a câmera segue o jogador
 LARGURA_MUNDO = 20
 ALTURA_MUNDO = 15
-LARGURA_TELA = LARGURA_MUNDO * TAMANHO_GRADE
-ALTURA_TELA = ALTURA_MUNDO * TAMANHO_GRADE + 64
+LARGURA_VISTA = 20
+ALTURA_VISTA = 15
+TAMANHO_BLOCO = 16
+# Atualiza os inimigos em lote com NumPy (útil com milhares de inimigos)
+USAR_ENXAME_INIMIGOS = False
+LARGURA_TELA = LARGURA_VISTA * TAMANHO_GRADE
+ALTURA_TELA = ALTURA_VISTA * TAMANHO_GRADE + 64
 
 # Estados do jogo
 ESTADO_MENU = 0
 ESTADO_JOGANDO = 1
 ESTADO_FIM_JOGO = 2
 
+# Tipos de célula do mapa
+PISO = 0
+PAREDE = 1
+
 teclas_pressionadas = {
     'esquerda': False,
     'direita': False,
@@ -48,6 +72,192 @@ teclas_pressionadas = {
     'baixo': False
 }
 
+class CacheSprites:
+    """Guarda as variações escaladas dos sprites prontas para desenhar
+
+    Os tamanhos são arredondados para múltiplos de passo_tamanho, para que a
+    animação de escala reutilize poucas variações.
+    """
+    def __init__(self, passo_tamanho=2, limite_bytes=4 * 1024 * 1024):
+        self.passo_tamanho = passo_tamanho
+        self.limite_bytes = limite_bytes
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.variacoes = OrderedDict()
+        self.originais = {}
+
+    def quantizar(self, tamanho):
+        passo = self.passo_tamanho
+        return max(passo, int(round(tamanho / passo)) * passo)
+
+    def obter(self, nome, tamanho):
+        chave = (nome, self.quantizar(tamanho))
+        superficie = self.variacoes.get(chave)
+        if superficie is not None:
+            self.acertos += 1
+            self.variacoes.move_to_end(chave)
+            return superficie
+
+        self.falhas += 1
+        original = self.originais.get(nome)
+        if original is None:
+            original = self.originais[nome] = images.load(nome)
+        lado = chave[1]
+        superficie = pygame.transform.scale(original, (lado, lado))
+        self.variacoes[chave] = superficie
+        self.bytes_usados += lado * lado * superficie.get_bytesize()
+
+        # Descartar as variações menos usadas quando passar do limite
+        while self.bytes_usados > self.limite_bytes and len(self.variacoes) > 1:
+            _, antiga = self.variacoes.popitem(last=False)
+            largura, altura = antiga.get_size()
+            self.bytes_usados -= largura * altura * antiga.get_bytesize()
+        return superficie
+
+    def limpar(self):
+        self.variacoes.clear()
+        self.originais.clear()
+        self.bytes_usados = 0
+
+cache_sprites = CacheSprites()
+
+def cores_fase(fase):
+    """Retorna as cores de fundo, parede e borda da parede da fase"""
+    if fase == 1:
+        return (15, 15, 25), (80, 80, 80), (60, 60, 60)
+    return (25, 10, 10), (100, 60, 60), (80, 40, 40)
+
+class CamadaParedes:
+    """Fundo e paredes do nível desenhados por blocos sob demanda"""
+    def __init__(self, limite_blocos=64):
+        self.limite_blocos = limite_blocos
+        self.blocos = OrderedDict()
+        self.versao = None
+        self.fase = None
+
+    def obter(self, jogo, bloco_x, bloco_y):
+        if self.versao != jogo.versao_paredes or self.fase != jogo.fase_atual:
+            self.blocos.clear()
+            self.versao = jogo.versao_paredes
+            self.fase = jogo.fase_atual
+        
+        chave = (bloco_x, bloco_y)
+        superficie = self.blocos.get(chave)
+        if superficie is None:
+            superficie = self.blocos[chave] = self.desenhar_bloco(jogo, bloco_x, bloco_y)
+            if len(self.blocos) > self.limite_blocos:
+                self.blocos.popitem(last=False)
+        else:
+            self.blocos.move_to_end(chave)
+        return superficie
+
+    def desenhar_bloco(self, jogo, bloco_x, bloco_y):
+        lado = TAMANHO_BLOCO * TAMANHO_GRADE
+        superficie = pygame.Surface((lado, lado))
+        cor_fundo, cor_parede, cor_borda_parede = cores_fase(jogo.fase_atual)
+        superficie.fill(cor_fundo)
+        
+        inicio_x = bloco_x * TAMANHO_BLOCO
+        inicio_y = bloco_y * TAMANHO_BLOCO
+        trecho = jogo.mapa[inicio_x:inicio_x + TAMANHO_BLOCO, inicio_y:inicio_y + TAMANHO_BLOCO]
+        for x, y in np.argwhere(trecho == PAREDE).tolist():
+            ret_parede = Rect(x * TAMANHO_GRADE, y * TAMANHO_GRADE, TAMANHO_GRADE, TAMANHO_GRADE)
+            pygame.draw.rect(superficie, cor_parede, ret_parede, 0)
+            pygame.draw.rect(superficie, cor_borda_parede, ret_parede, 1)
+        return superficie
+
+camada_paredes = CamadaParedes()
+
+class Camera:
+    """Área visível do mundo, em pixels, centrada no personagem seguido"""
+    def __init__(self, largura, altura):
+        self.largura = largura
+        self.altura = altura
+        self.x = 0
+        self.y = 0
+
+    def seguir(self, pixel_x, pixel_y):
+        limite_x = max(0, LARGURA_MUNDO * TAMANHO_GRADE - self.largura)
+        limite_y = max(0, ALTURA_MUNDO * TAMANHO_GRADE - self.altura)
+        centro_x = pixel_x + TAMANHO_GRADE // 2
+        centro_y = pixel_y + TAMANHO_GRADE // 2
+        self.x = int(min(max(centro_x - self.largura // 2, 0), limite_x))
+        self.y = int(min(max(centro_y - self.altura // 2, 0), limite_y))
+
+    def celulas_visiveis(self, margem=0):
+        """Retorna (x0, y0, x1, y1), intervalo semiaberto de células visíveis"""
+        x0 = max(0, self.x // TAMANHO_GRADE - margem)
+        y0 = max(0, self.y // TAMANHO_GRADE - margem)
+        x1 = min(LARGURA_MUNDO, (self.x + self.largura - 1) // TAMANHO_GRADE + 1 + margem)
+        y1 = min(ALTURA_MUNDO, (self.y + self.altura - 1) // TAMANHO_GRADE + 1 + margem)
+        return x0, y0, x1, y1
+
+camera = Camera(LARGURA_VISTA * TAMANHO_GRADE, ALTURA_VISTA * TAMANHO_GRADE)
+
+class CacheHud:
+    """Interface do usuário refeita só quando os valores mostrados mudam"""
+    def __init__(self, altura=55):
+        self.altura = altura
+        self.valores = None
+
+    def verificar(self, jogo, camada):
+        """Invalida a camada da interface se algum valor mostrado mudou"""
+        valores = (jogo.jogador.pontuacao, jogo.jogador.vida,
+                   len(jogo.tesouros), jogo.fase_atual)
+        if valores != self.valores:
+            self.valores = valores
+            camada.invalidate()
+
+    def desenhar(self, tela, alfa=1.0):
+        pontuacao, vida, tesouros, fase = self.valores
+        tela.fill((40, 40, 40))
+        
+        tela.draw.text(f"Pontuação: {pontuacao}", (10, 10),
+                       fontsize=20, color="white")
+        tela.draw.text(f"Vida: {vida}", (10, 35),
+                       fontsize=20, color="white")
+        tela.draw.text(f"Tesouros: {tesouros}", (200, 10),
+                       fontsize=20, color="white")
+        tela.draw.text(f"Fase: {fase}", (350, 10),
+                       fontsize=20, color="white")
+
+cache_hud = CacheHud()
+
+class GradeOcupacao:
+    """Índice por célula de paredes, inimigos e tesouros"""
+    def __init__(self):
+        self.mapa = np.zeros((LARGURA_MUNDO, ALTURA_MUNDO), dtype=np.uint8)
+        self.tesouros = set()
+        self.inimigos = {}
+
+    def adicionar_personagem(self, personagem):
+        celula = (personagem.grade_x, personagem.grade_y)
+        self.inimigos.setdefault(celula, []).append(personagem)
+        personagem.ocupacao = self
+
+    def mover_personagem(self, personagem, celula_antiga, celula_nova):
+        ocupantes = self.inimigos.get(celula_antiga)
+        if ocupantes:
+            ocupantes.remove(personagem)
+            if not ocupantes:
+                del self.inimigos[celula_antiga]
+        self.inimigos.setdefault(celula_nova, []).append(personagem)
+
+    def inimigos_em(self, x, y):
+        return self.inimigos.get((x, y), ())
+
+    def bloqueada(self, x, y):
+        if x < 0 or x >= LARGURA_MUNDO or y < 0 or y >= ALTURA_MUNDO:
+            return True
+        return self.mapa[x, y] == PAREDE or (x, y) in self.inimigos
+
+    def coletar_tesouro(self, x, y):
+        if (x, y) in self.tesouros:
+            self.tesouros.discard((x, y))
+            return True
+        return False
+
 class AnimadorSprite:
     def __init__(self, sprites, duracao_quadro=0.2):
         self.sprites = sprites
@@ -83,13 +293,19 @@ class Personagem:
         self.pixel_y = y * TAMANHO_GRADE
         self.alvo_x = self.pixel_x
         self.alvo_y = self.pixel_y
+        self.anterior_x = self.pixel_x
+        self.anterior_y = self.pixel_y
         self.velocidade = 120
         self.movendo = False
+        self.ocupacao = None
         
         self.animador_parado = AnimadorSprite(sprites_parado, 0.8)
         self.animador_movimento = AnimadorSprite(sprites_movimento, 0.3)
         
     def atualizar(self, dt):
+        # Posição do passo anterior, para interpolar o desenho entre passos
+        self.anterior_x = self.pixel_x
+        self.anterior_y = self.pixel_y
         self.animador_parado.atualizar(dt, self.movendo)
         self.animador_movimento.atualizar(dt, self.movendo)
         
@@ -109,6 +325,9 @@ class Personagem:
     
     def mover_para(self, grade_x, grade_y):
         if not self.movendo:
+            if self.ocupacao is not None:
+                self.ocupacao.mover_personagem(
+                    self, (self.grade_x, self.grade_y), (grade_x, grade_y))
             self.grade_x = grade_x
             self.grade_y = grade_y
             self.alvo_x = grade_x * TAMANHO_GRADE
@@ -127,6 +346,10 @@ class Personagem:
         else:
             return self.animador_parado.escala
     
+    def obter_posicao_interpolada(self, alfa):
+        return (self.anterior_x + (self.pixel_x - self.anterior_x) * alfa,
+                self.anterior_y + (self.pixel_y - self.anterior_y) * alfa)
+    
     def obter_retangulo(self):
         return Rect(self.pixel_x, self.pixel_y, TAMANHO_GRADE, TAMANHO_GRADE)
 
@@ -138,7 +361,38 @@ class Jogador(Personagem):
         self.pontuacao = 0
         self.vida = 3
 
+class CampoEnxame:
+    """Atributo do inimigo guardado no enxame quando ele pertence a um"""
+    def __init__(self, nome, tipo):
+        self.nome = nome
+        self.tipo = tipo
+
+    def __get__(self, inimigo, dono=None):
+        if inimigo is None:
+            return self
+        if inimigo.enxame is None:
+            return inimigo.__dict__[self.nome]
+        return self.tipo(getattr(inimigo.enxame, self.nome)[inimigo.indice_enxame])
+
+    def __set__(self, inimigo, valor):
+        if inimigo.enxame is None:
+            inimigo.__dict__[self.nome] = valor
+        else:
+            getattr(inimigo.enxame, self.nome)[inimigo.indice_enxame] = valor
+
 class Inimigo(Personagem):
+    enxame = None
+    indice_enxame = None
+    pixel_x = CampoEnxame('pixel_x', float)
+    pixel_y = CampoEnxame('pixel_y', float)
+    anterior_x = CampoEnxame('anterior_x', float)
+    anterior_y = CampoEnxame('anterior_y', float)
+    alvo_x = CampoEnxame('alvo_x', float)
+    alvo_y = CampoEnxame('alvo_y', float)
+    movendo = CampoEnxame('movendo', bool)
+    cronometro_movimento = CampoEnxame('cronometro_movimento', float)
+    intervalo_movimento = CampoEnxame('intervalo_movimento', float)
+    
     def __init__(self, x, y, tipo_inimigo):
         sprites_parado = ["enemy_idle1"]
         sprites_movimento = ["enemy_idle1"]
@@ -178,6 +432,95 @@ class Inimigo(Personagem):
                     if not jogo.posicao_bloqueada(novo_x, novo_y):
                         self.mover_para(novo_x, novo_y)
                         break
+    
+    def obter_escala_atual(self):
+        if self.enxame is not None:
+            return float(self.enxame.escala[self.indice_enxame])
+        return super().obter_escala_atual()
+
+class EnxameInimigos:
+    """Estado dos inimigos em arrays NumPy, atualizado em lote a cada quadro"""
+    CAMPOS = {
+        'pixel_x': np.float64,
+        'pixel_y': np.float64,
+        'anterior_x': np.float64,
+        'anterior_y': np.float64,
+        'alvo_x': np.float64,
+        'alvo_y': np.float64,
+        'velocidade': np.float64,
+        'movendo': np.bool_,
+        'cronometro_movimento': np.float64,
+        'intervalo_movimento': np.float64,
+        'tempo_animacao': np.float64,
+        'escala': np.float64,
+    }
+
+    def __init__(self, capacidade=64):
+        self.inimigos = []
+        for nome, tipo in self.CAMPOS.items():
+            setattr(self, nome, np.zeros(capacidade, dtype=tipo))
+
+    def adicionar(self, inimigo):
+        indice = len(self.inimigos)
+        if indice == len(self.pixel_x):
+            for nome in self.CAMPOS:
+                antigo = getattr(self, nome)
+                novo = np.zeros(len(antigo) * 2, dtype=antigo.dtype)
+                novo[:indice] = antigo
+                setattr(self, nome, novo)
+        
+        for nome in self.CAMPOS:
+            if nome not in ('tempo_animacao', 'escala'):
+                getattr(self, nome)[indice] = getattr(inimigo, nome)
+        self.tempo_animacao[indice] = inimigo.animador_parado.tempo_animacao
+        self.escala[indice] = inimigo.obter_escala_atual()
+        
+        self.inimigos.append(inimigo)
+        inimigo.enxame = self
+        inimigo.indice_enxame = indice
+
+    def atualizar(self, dt):
+        n = len(self.inimigos)
+        if n == 0:
+            return
+        pixel_x = self.pixel_x[:n]
+        pixel_y = self.pixel_y[:n]
+        alvo_x = self.alvo_x[:n]
+        alvo_y = self.alvo_y[:n]
+        movendo = self.movendo[:n]
+        cronometro = self.cronometro_movimento[:n]
+        intervalo = self.intervalo_movimento[:n]
+        tempo = self.tempo_animacao[:n]
+        
+        self.anterior_x[:n] = pixel_x
+        self.anterior_y[:n] = pixel_y
+        
+        # Animação de escala (respiração), como em AnimadorSprite
+        tempo += dt
+        self.escala[:n] = np.where(movendo, 1.0 + 0.1 * np.sin(tempo * 8),
+                                   1.0 + 0.05 * np.sin(tempo * 3))
+        
+        # Interpolação até o alvo, como em Personagem.atualizar
+        dx = alvo_x - pixel_x
+        dy = alvo_y - pixel_y
+        distancia = np.hypot(dx, dy)
+        chegou = movendo & (distancia < 2)
+        andando = movendo & ~chegou
+        if andando.any():
+            fator = self.velocidade[:n][andando] * dt / distancia[andando]
+            pixel_x[andando] += dx[andando] * fator
+            pixel_y[andando] += dy[andando] * fator
+        pixel_x[chegou] = alvo_x[chegou]
+        pixel_y[chegou] = alvo_y[chegou]
+        movendo[chegou] = False
+        
+        # Só os inimigos com o cronômetro vencido decidem para onde ir
+        parados = ~movendo
+        cronometro[parados] += dt
+        for i in np.flatnonzero(parados & (cronometro >= intervalo)).tolist():
+            cronometro[i] = 0
+            intervalo[i] = random.uniform(1.5, 3.5)
+            self.inimigos[i].mover_aleatoriamente()
 
 class Jogo:
     def __init__(self):
@@ -188,6 +531,8 @@ class Jogo:
         self.velocidade_movimento = 0.15 
         self.fase_atual = 1
         self.musica_inicializada = False
+        self.versao_paredes = 0
+        self.usar_enxame = USAR_ENXAME_INIMIGOS
         self.reiniciar_jogo()
         
     def inicializar_musica(self):
@@ -221,24 +566,29 @@ class Jogo:
     def reiniciar_jogo(self):
         self.fase_atual = 1
         self.jogador = Jogador(1, 1)
-        self.inimigos = []
-        self.tesouros = []
-        self.paredes = set()
+        self.limpar_nivel()
         self.gerar_nivel()
     
+    def limpar_nivel(self):
+        cache_sprites.limpar()
+        self.inimigos = []
+        self.enxame = EnxameInimigos() if self.usar_enxame else None
+        self.ocupacao = GradeOcupacao()
+        self.mapa = self.ocupacao.mapa
+        self.tesouros = self.ocupacao.tesouros
+    
     def gerar_nivel(self):
-        # Gerar paredes nas bordas e aleatoriamente pelo mapa
-        for x in range(LARGURA_MUNDO):
-            for y in range(ALTURA_MUNDO):
-                if x == 0 or x == LARGURA_MUNDO-1 or y == 0 or y == ALTURA_MUNDO-1:
-                    self.paredes.add((x, y))
-                elif random.random() < 0.12:
-                    self.paredes.add((x, y))
+        # Gerar paredes aleatoriamente pelo mapa e nas bordas
+        gerador = np.random.default_rng(random.getrandbits(64))
+        self.mapa[:] = np.where(gerador.random(self.mapa.shape) < 0.12, PAREDE, PISO)
+        self.mapa[[0, -1], :] = PAREDE
+        self.mapa[:, [0, -1]] = PAREDE
         
         # Limpar área ao redor da posição inicial do jogador (1, 1)
-        for dx in range(-1, 2):
-            for dy in range(-1, 2):
-                self.paredes.discard((1 + dx, 1 + dy))
+        self.mapa[0:3, 0:3] = PISO
+        
+        # Um único flood fill a partir do jogador serve para todo o nível
+        self.celulas_acessiveis = self.calcular_celulas_acessiveis(1, 1)
         
         # Gerar inimigos
         contador_inimigos = 0
@@ -246,13 +596,16 @@ class Jogo:
         while contador_inimigos < 6 and tentativas < 100:
             x = random.randint(4, LARGURA_MUNDO-2)
             y = random.randint(4, ALTURA_MUNDO-2)
-            if not self.posicao_bloqueada_apenas_paredes(x, y):
+            if self.posicao_acessivel(x, y):
                 if math.sqrt((x - 1)**2 + (y - 1)**2) > 3:
                     tipo_inimigo = random.choice(['goblin', 'orc'])
                     velocidade_inimigo = 1.0 if self.fase_atual == 1 else 0.5
                     inimigo = Inimigo(x, y, tipo_inimigo)
                     inimigo.intervalo_movimento = random.uniform(1.5, 3.5) * velocidade_inimigo
                     self.inimigos.append(inimigo)
+                    self.ocupacao.adicionar_personagem(inimigo)
+                    if self.enxame is not None:
+                        self.enxame.adicionar(inimigo)
                     contador_inimigos += 1
             tentativas += 1
         
@@ -263,44 +616,58 @@ class Jogo:
             x = random.randint(1, LARGURA_MUNDO-2)
             y = random.randint(1, ALTURA_MUNDO-2)
             if (not self.posicao_bloqueada_apenas_paredes(x, y) and 
+                (x, y) not in self.tesouros and
                 math.sqrt((x - 1)**2 + (y - 1)**2) > 1 and
                 self.posicao_acessivel(x, y)):
-                self.tesouros.append((x, y))
+                self.tesouros.add((x, y))
                 contador_tesouros += 1
             tentativas += 1
         
-    def posicao_acessivel(self, alvo_x, alvo_y):
-        if (alvo_x, alvo_y) in self.paredes:
-            return False
+        self.invalidar_paredes()
+    
+    def invalidar_paredes(self):
+        """Avisa que as paredes mudaram e a camada estática deve ser refeita"""
+        self.versao_paredes += 1
         
-        visitados = set()
-        fila = [(1, 1)]
+    def calcular_celulas_acessiveis(self, inicio_x, inicio_y):
+        """Retorna a máscara das células alcançáveis a partir do início"""
+        largura, altura = self.mapa.shape
+        total = largura * altura
+        # A busca anda sobre índices lineares (x * altura + y) do mapa achatado
+        livre = (self.mapa == PISO).ravel().tolist()
+        visitados = bytearray(total)
+        
+        inicio = inicio_x * altura + inicio_y
+        fila = deque()
+        if livre[inicio]:
+            visitados[inicio] = 1
+            fila.append(inicio)
         
         while fila:
-            x, y = fila.pop(0)
-            if (x, y) in visitados:
-                continue
-            visitados.add((x, y))
-            
-            if x == alvo_x and y == alvo_y:
-                return True
-            
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                novo_x, novo_y = x + dx, y + dy
-                if (0 <= novo_x < LARGURA_MUNDO and 
-                    0 <= novo_y < ALTURA_MUNDO and
-                    (novo_x, novo_y) not in self.paredes and
-                    (novo_x, novo_y) not in visitados):
-                    fila.append((novo_x, novo_y))
+            i = fila.popleft()
+            y = i % altura
+            vizinhos = (
+                i - altura if i >= altura else -1,
+                i + altura if i + altura < total else -1,
+                i - 1 if y > 0 else -1,
+                i + 1 if y < altura - 1 else -1,
+            )
+            for vizinho in vizinhos:
+                if vizinho >= 0 and livre[vizinho] and not visitados[vizinho]:
+                    visitados[vizinho] = 1
+                    fila.append(vizinho)
         
-        return False
+        return np.frombuffer(visitados, dtype=np.bool_).reshape(largura, altura)
+    
+    def posicao_acessivel(self, alvo_x, alvo_y):
+        if alvo_x < 0 or alvo_x >= LARGURA_MUNDO or alvo_y < 0 or alvo_y >= ALTURA_MUNDO:
+            return False
+        return bool(self.celulas_acessiveis[alvo_x, alvo_y])
 
     def posicao_bloqueada_apenas_paredes(self, x, y):
         if x < 0 or x >= LARGURA_MUNDO or y < 0 or y >= ALTURA_MUNDO:
             return True
-        if (x, y) in self.paredes:
-            return True
-        return False
+        return self.mapa[x, y] == PAREDE
 
     def avancar_fase(self):
         self.fase_atual += 1
@@ -310,21 +677,14 @@ class Jogo:
         self.jogador.pixel_y = TAMANHO_GRADE
         self.jogador.alvo_x = self.jogador.pixel_x
         self.jogador.alvo_y = self.jogador.pixel_y
+        self.jogador.anterior_x = self.jogador.pixel_x
+        self.jogador.anterior_y = self.jogador.pixel_y
         self.jogador.movendo = False
-        self.inimigos = []
-        self.tesouros = []
-        self.paredes = set()
+        self.limpar_nivel()
         self.gerar_nivel()
     
     def posicao_bloqueada(self, x, y):
-        if x < 0 or x >= LARGURA_MUNDO or y < 0 or y >= ALTURA_MUNDO:
-            return True
-        if (x, y) in self.paredes:
-            return True
-        for inimigo in self.inimigos:
-            if inimigo.grade_x == x and inimigo.grade_y == y:
-                return True
-        return False
+        return self.ocupacao.bloqueada(x, y)
         
     def atualizar(self, dt):
         # Inicializar música quando o jogo estiver rodando
@@ -340,8 +700,11 @@ class Jogo:
                     self.cronometro_movimento = 0
                     self.processar_movimento_continuo()
             
-            for inimigo in self.inimigos:
-                inimigo.atualizar(dt)
+            if self.enxame is not None:
+                self.enxame.atualizar(dt)
+            else:
+                for inimigo in self.inimigos:
+                    inimigo.atualizar(dt)
             
             self.verificar_colisoes()
             self.verificar_tesouros()
@@ -352,6 +715,22 @@ class Jogo:
                 else:
                     self.estado = ESTADO_FIM_JOGO
     
+    def simular(self, quadros, dt=1/60, entrada=None, reiniciar=True):
+        """Avança a lógica sem janela nem draw(), com dt fixo.
+        
+        entrada(quadro, jogo) devolve teclas no formato de teclas_pressionadas,
+        usadas no lugar do teclado. Retorna quantos níveis foram gerados.
+        """
+        versao_inicial = self.versao_paredes
+        for quadro in range(quadros):
+            if entrada is not None:
+                teclas_pressionadas.update(entrada(quadro, self))
+            if self.estado != ESTADO_JOGANDO and reiniciar:
+                self.estado = ESTADO_JOGANDO
+                self.reiniciar_jogo()
+            self.atualizar(dt)
+        return self.versao_paredes - versao_inicial
+    
     def processar_movimento_continuo(self):
         novo_x, novo_y = self.jogador.grade_x, self.jogador.grade_y
         
@@ -369,194 +748,239 @@ class Jogo:
                 self.jogador.mover_para(novo_x, novo_y)
 
     def verificar_colisoes(self):
-        for inimigo in self.inimigos:
-            if (self.jogador.grade_x == inimigo.grade_x and 
-                self.jogador.grade_y == inimigo.grade_y):
-                self.estado = ESTADO_FIM_JOGO
-                global teclas_pressionadas
-                teclas_pressionadas = {
-                    'esquerda': False,
-                    'direita': False,
-                    'cima': False,
-                    'baixo': False
-                }
-                break
+        if self.ocupacao.inimigos_em(self.jogador.grade_x, self.jogador.grade_y):
+            self.estado = ESTADO_FIM_JOGO
+            global teclas_pressionadas
+            teclas_pressionadas = {
+                'esquerda': False,
+                'direita': False,
+                'cima': False,
+                'baixo': False
+            }
     
     def verificar_tesouros(self):
-        posicao_jogador = (self.jogador.grade_x, self.jogador.grade_y)
-        if posicao_jogador in self.tesouros:
-            self.tesouros.remove(posicao_jogador)
+        if self.ocupacao.coletar_tesouro(self.jogador.grade_x, self.jogador.grade_y):
             self.jogador.pontuacao += 10
 
 jogo = Jogo()
 
 def update(dt):
+    estado_anterior = jogo.estado
     jogo.atualizar(dt)
+    # Menu e fim de jogo são estáticos; só o jogo em andamento anima a tela
+    if jogo.estado == ESTADO_JOGANDO or jogo.estado != estado_anterior:
+        screen.invalidate()
 
-def draw():
-    screen.clear()
-    
+# Botões do menu, usados no desenho e no clique
+BOTAO_INICIAR = Rect(LARGURA_TELA//2 - 100, 180, 200, 50)
+BOTAO_MUSICA = Rect(LARGURA_TELA//2 - 100, 250, 200, 50)
+BOTAO_SAIR = Rect(LARGURA_TELA//2 - 100, 320, 200, 50)
+
+class TelaEmCache:
+    """Tela estática composta numa superfície e refeita só quando a chave muda"""
+    def __init__(self, desenhar, chave):
+        self.desenhar = desenhar
+        self.chave = chave
+        self.superficie = None
+        self.valor_chave = None
+
+    def obter(self):
+        valor_chave = self.chave()
+        if self.superficie is None or valor_chave != self.valor_chave:
+            if self.superficie is None:
+                self.superficie = pygame.Surface((LARGURA_TELA, ALTURA_TELA))
+            self.desenhar(Screen(self.superficie))
+            self.valor_chave = valor_chave
+        return self.superficie
+
+tela_menu = TelaEmCache(lambda tela: desenhar_menu(tela),
+                        lambda: jogo.musica_ativada)
+tela_fim_jogo = TelaEmCache(lambda tela: desenhar_fim_jogo(tela),
+                            lambda: (jogo.jogador.vida <= 0, jogo.jogador.pontuacao))
+
+def draw(alpha):
     if jogo.estado == ESTADO_MENU:
-        desenhar_menu()
+        screen.blit(tela_menu.obter(), (0, 0))
     elif jogo.estado == ESTADO_JOGANDO:
-        desenhar_jogo()
+        desenhar_jogo(alpha)
     elif jogo.estado == ESTADO_FIM_JOGO:
-        desenhar_fim_jogo()
+        screen.blit(tela_fim_jogo.obter(), (0, 0))
 
-def desenhar_menu():
-    screen.fill((20, 20, 40))
+def desenhar_menu(tela):
+    tela.fill((20, 20, 40))
     
     cor_titulo = (255, 255, 255)
-    screen.draw.text("EXPLORADOR DE MASMORRAS", center=(LARGURA_TELA//2, 80), 
-                    fontsize=36, color=cor_titulo)
-    
-    botao_iniciar = Rect(LARGURA_TELA//2 - 100, 180, 200, 50)
-    botao_musica = Rect(LARGURA_TELA//2 - 100, 250, 200, 50)
-    botao_sair = Rect(LARGURA_TELA//2 - 100, 320, 200, 50)
+    tela.draw.text("EXPLORADOR DE MASMORRAS", center=(LARGURA_TELA//2, 80), 
+                  fontsize=36, color=cor_titulo)
     
     cor_botao = (60, 60, 80)
-    screen.draw.filled_rect(botao_iniciar, cor_botao)
-    screen.draw.filled_rect(botao_musica, cor_botao)
-    screen.draw.filled_rect(botao_sair, cor_botao)
+    tela.draw.filled_rect(BOTAO_INICIAR, cor_botao)
+    tela.draw.filled_rect(BOTAO_MUSICA, cor_botao)
+    tela.draw.filled_rect(BOTAO_SAIR, cor_botao)
     
-    screen.draw.rect(botao_iniciar, (100, 100, 120))
-    screen.draw.rect(botao_musica, (100, 100, 120))
-    screen.draw.rect(botao_sair, (100, 100, 120))
+    tela.draw.rect(BOTAO_INICIAR, (100, 100, 120))
+    tela.draw.rect(BOTAO_MUSICA, (100, 100, 120))
+    tela.draw.rect(BOTAO_SAIR, (100, 100, 120))
     
-    screen.draw.text("INICIAR JOGO", center=botao_iniciar.center, 
-                    fontsize=20, color="white")
+    tela.draw.text("INICIAR JOGO", center=BOTAO_INICIAR.center, 
+                  fontsize=20, color="white")
     
     texto_musica = f"MÚSICA: {'LIGADA' if jogo.musica_ativada else 'DESLIGADA'}"
-    screen.draw.text(texto_musica, center=botao_musica.center, 
-                    fontsize=20, color="white")
+    tela.draw.text(texto_musica, center=BOTAO_MUSICA.center, 
+                  fontsize=20, color="white")
     
-    screen.draw.text("SAIR", center=botao_sair.center, 
-                    fontsize=20, color="white")
+    tela.draw.text("SAIR", center=BOTAO_SAIR.center, 
+                  fontsize=20, color="white")
     
-    screen.draw.text("Use as setas para se mover", center=(LARGURA_TELA//2, 400), 
-                    fontsize=16, color=(150, 150, 150))
-    screen.draw.text("Colete todos os tesouros para vencer!", center=(LARGURA_TELA//2, 420), 
-                    fontsize=16, color=(150, 150, 150))
+    tela.draw.text("Use as setas para se mover", center=(LARGURA_TELA//2, 400), 
+                  fontsize=16, color=(150, 150, 150))
+    tela.draw.text("Colete todos os tesouros para vencer!", center=(LARGURA_TELA//2, 420), 
+                  fontsize=16, color=(150, 150, 150))
 
-def desenhar_jogo():
-    if jogo.fase_atual == 1:
-        screen.fill((15, 15, 25))
+def inimigos_visiveis(x0, y0, x1, y1):
+    # Com poucos inimigos é mais barato filtrar a lista que varrer as células
+    if len(jogo.inimigos) < (x1 - x0) * (y1 - y0):
+        for inimigo in jogo.inimigos:
+            if x0 <= inimigo.grade_x < x1 and y0 <= inimigo.grade_y < y1:
+                yield inimigo
     else:
-        screen.fill((25, 10, 10))
-    
-    cor_parede = (80, 80, 80) if jogo.fase_atual == 1 else (100, 60, 60)
-    cor_borda_parede = (60, 60, 60) if jogo.fase_atual == 1 else (80, 40, 40)
-    
-    for x, y in jogo.paredes:
-        ret_parede = Rect(x * TAMANHO_GRADE, y * TAMANHO_GRADE, TAMANHO_GRADE, TAMANHO_GRADE)
-        screen.draw.filled_rect(ret_parede, cor_parede)
-        screen.draw.rect(ret_parede, cor_borda_parede)
-    
-    # Desenhar tesouros
-    for x, y in jogo.tesouros:
-        ret_tesouro = Rect(x * TAMANHO_GRADE + 6, y * TAMANHO_GRADE + 6, 
-                          TAMANHO_GRADE - 12, TAMANHO_GRADE - 12)
-        screen.draw.filled_rect(ret_tesouro, (255, 215, 0))
-        ret_interno = Rect(x * TAMANHO_GRADE + 10, y * TAMANHO_GRADE + 10, 
-                          TAMANHO_GRADE - 20, TAMANHO_GRADE - 20)
-        screen.draw.filled_rect(ret_interno, (255, 255, 150))
-    
-    # Desenhar inimigos com sprites
-    for inimigo in jogo.inimigos:
+        for x in range(x0, x1):
+            for y in range(y0, y1):
+                yield from jogo.ocupacao.inimigos_em(x, y)
+
+def desenhar_jogo(alfa=1.0):
+    # Personagens são desenhados entre o passo anterior e o atual da simulação
+    jogador_x, jogador_y = jogo.jogador.obter_posicao_interpolada(alfa)
+    camera.seguir(jogador_x, jogador_y)
+    # As camadas do mundo são desenhadas em coordenadas do mundo
+    screen.camera.pos = (camera.x, camera.y)
+    cache_hud.verificar(jogo, camadas['hud'])
+    camadas.draw(screen, alfa)
+    screen.camera.pos = (0, 0)
+
+def desenhar_fundo(tela, alfa):
+    cor_fundo = cores_fase(jogo.fase_atual)[0]
+    tela.fill(cor_fundo)
+
+def desenhar_mundo(tela, alfa):
+    # Fundo e paredes só são redesenhados quando o nível muda,
+    # e só os blocos visíveis pela câmera são desenhados
+    lado_bloco = TAMANHO_BLOCO * TAMANHO_GRADE
+    x0, y0, x1, y1 = camera.celulas_visiveis()
+    tela.blit_many(
+        (camada_paredes.obter(jogo, bloco_x, bloco_y),
+         (bloco_x * lado_bloco, bloco_y * lado_bloco))
+        for bloco_x in range(x0 // TAMANHO_BLOCO, (x1 - 1) // TAMANHO_BLOCO + 1)
+        for bloco_y in range(y0 // TAMANHO_BLOCO, (y1 - 1) // TAMANHO_BLOCO + 1)
+    )
+
+def desenhar_tesouros(tela, alfa):
+    # Gravados num lote e desenhados de uma vez
+    lote = tela.batch()
+    x0, y0, x1, y1 = camera.celulas_visiveis()
+    tesouros = jogo.tesouros
+    for x in range(x0, x1):
+        for y in range(y0, y1):
+            if (x, y) not in tesouros:
+                continue
+            mundo_x = x * TAMANHO_GRADE
+            mundo_y = y * TAMANHO_GRADE
+            ret_tesouro = Rect(mundo_x + 6, mundo_y + 6, 
+                              TAMANHO_GRADE - 12, TAMANHO_GRADE - 12)
+            lote.filled_rect(ret_tesouro, (255, 215, 0))
+            ret_interno = Rect(mundo_x + 10, mundo_y + 10, 
+                              TAMANHO_GRADE - 20, TAMANHO_GRADE - 20)
+            lote.filled_rect(ret_interno, (255, 255, 150))
+    lote.submit()
+
+def desenhar_personagens(tela, alfa):
+    lote = tela.batch()
+    
+    # Desenhar inimigos com sprites (a margem cobre quem está entre células)
+    for inimigo in inimigos_visiveis(*camera.celulas_visiveis(margem=1)):
+        inimigo_x, inimigo_y = inimigo.obter_posicao_interpolada(alfa)
         try:
             sprite_nome = inimigo.obter_sprite_atual()
             escala = inimigo.obter_escala_atual()
             
-            tamanho_sprite = int(24 * escala)
-            pos_x = int(inimigo.pixel_x + TAMANHO_GRADE//2 - tamanho_sprite//2)
-            pos_y = int(inimigo.pixel_y + TAMANHO_GRADE//2 - tamanho_sprite//2)
-            
-            sprite_actor = Actor(sprite_nome)
-            sprite_actor.pos = (pos_x + tamanho_sprite//2, pos_y + tamanho_sprite//2)
-            
-            import pygame
-            sprite_surface = pygame.transform.scale(sprite_actor._surf, (tamanho_sprite, tamanho_sprite))
-            screen.blit(sprite_surface, (pos_x, pos_y))
+            sprite_surface = cache_sprites.obter(sprite_nome, 24 * escala)
+            tamanho_sprite = sprite_surface.get_width()
+            pos_x = int(inimigo_x + TAMANHO_GRADE//2 - tamanho_sprite//2)
+            pos_y = int(inimigo_y + TAMANHO_GRADE//2 - tamanho_sprite//2)
+            lote.blit(sprite_surface, (pos_x, pos_y))
             
         except:
-            ret_inimigo = Rect(inimigo.pixel_x + 4, inimigo.pixel_y + 4, 
+            ret_inimigo = Rect(inimigo_x + 4, inimigo_y + 4, 
                               TAMANHO_GRADE - 8, TAMANHO_GRADE - 8)
-            screen.draw.filled_rect(ret_inimigo, (255, 0, 0))
+            lote.filled_rect(ret_inimigo, (255, 0, 0))
             tamanho_olho = 3
-            olho_esquerdo = Rect(inimigo.pixel_x + 10, inimigo.pixel_y + 10, tamanho_olho, tamanho_olho)
-            olho_direito = Rect(inimigo.pixel_x + 18, inimigo.pixel_y + 10, tamanho_olho, tamanho_olho)
-            screen.draw.filled_rect(olho_esquerdo, (255, 255, 255))
-            screen.draw.filled_rect(olho_direito, (255, 255, 255))
+            olho_esquerdo = Rect(inimigo_x + 10, inimigo_y + 10, tamanho_olho, tamanho_olho)
+            olho_direito = Rect(inimigo_x + 18, inimigo_y + 10, tamanho_olho, tamanho_olho)
+            lote.filled_rect(olho_esquerdo, (255, 255, 255))
+            lote.filled_rect(olho_direito, (255, 255, 255))
     
     # Desenhar jogador com sprite
+    jogador_x, jogador_y = jogo.jogador.obter_posicao_interpolada(alfa)
     try:
         sprite_nome = jogo.jogador.obter_sprite_atual()
         escala = jogo.jogador.obter_escala_atual()
         
-        tamanho_sprite = int(24 * escala)
-        pos_x = int(jogo.jogador.pixel_x + TAMANHO_GRADE//2 - tamanho_sprite//2)
-        pos_y = int(jogo.jogador.pixel_y + TAMANHO_GRADE//2 - tamanho_sprite//2)
-        
-        sprite_actor = Actor(sprite_nome)
-        sprite_actor.pos = (pos_x + tamanho_sprite//2, pos_y + tamanho_sprite//2)
-        
-        import pygame
-        sprite_surface = pygame.transform.scale(sprite_actor._surf, (tamanho_sprite, tamanho_sprite))
-        screen.blit(sprite_surface, (pos_x, pos_y))
+        sprite_surface = cache_sprites.obter(sprite_nome, 24 * escala)
+        tamanho_sprite = sprite_surface.get_width()
+        pos_x = int(jogador_x + TAMANHO_GRADE//2 - tamanho_sprite//2)
+        pos_y = int(jogador_y + TAMANHO_GRADE//2 - tamanho_sprite//2)
+        lote.blit(sprite_surface, (pos_x, pos_y))
         
     except:
-        ret_jogador = Rect(jogo.jogador.pixel_x + 4, jogo.jogador.pixel_y + 4, 
+        ret_jogador = Rect(jogador_x + 4, jogador_y + 4, 
                           TAMANHO_GRADE - 8, TAMANHO_GRADE - 8)
-        screen.draw.filled_rect(ret_jogador, (0, 255, 0))
+        lote.filled_rect(ret_jogador, (0, 255, 0))
         tamanho_olho = 2
-        olho_esquerdo = Rect(jogo.jogador.pixel_x + 10, jogo.jogador.pixel_y + 10, tamanho_olho, tamanho_olho)
-        olho_direito = Rect(jogo.jogador.pixel_x + 20, jogo.jogador.pixel_y + 10, tamanho_olho, tamanho_olho)
-        screen.draw.filled_rect(olho_esquerdo, (0, 0, 0))
-        screen.draw.filled_rect(olho_direito, (0, 0, 0))
-    
-    # Interface do usuário
-    ui_y = ALTURA_TELA - 55
-    screen.draw.filled_rect(Rect(0, ui_y, LARGURA_TELA, 64), (40, 40, 40))
-    
-    screen.draw.text(f"Pontuação: {jogo.jogador.pontuacao}", (10, ui_y + 10), 
-                    fontsize=20, color="white")
-    screen.draw.text(f"Vida: {jogo.jogador.vida}", (10, ui_y + 35), 
-                    fontsize=20, color="white")
-    screen.draw.text(f"Tesouros: {len(jogo.tesouros)}", (200, ui_y + 10), 
-                    fontsize=20, color="white")
-    screen.draw.text(f"Fase: {jogo.fase_atual}", (350, ui_y + 10), 
-                    fontsize=20, color="white")
-
-def desenhar_fim_jogo():
-    screen.fill((0, 0, 0))
+        olho_esquerdo = Rect(jogador_x + 10, jogador_y + 10, tamanho_olho, tamanho_olho)
+        olho_direito = Rect(jogador_x + 20, jogador_y + 10, tamanho_olho, tamanho_olho)
+        lote.filled_rect(olho_esquerdo, (0, 0, 0))
+        lote.filled_rect(olho_direito, (0, 0, 0))
+    lote.submit()
+
+# Camadas do jogo, de baixo para cima; o fundo e as paredes já vêm de blocos
+# em cache, e a interface só é refeita quando o cache_hud a invalida.
+# O mundo fica recortado na área da câmera, sem invadir a faixa da interface
+area_vista = Rect(0, 0, camera.largura, camera.altura)
+camadas = Compositor()
+camadas.add('fundo', desenhar_fundo, z=0)
+camadas.add('mundo', desenhar_mundo, z=0, clip=area_vista)
+camadas.add('tesouros', desenhar_tesouros, z=1, clip=area_vista)
+camadas.add('personagens', desenhar_personagens, z=2, clip=area_vista)
+camadas.add('hud', cache_hud.desenhar, z=3, static=True, scroll=False,
+            opaque=True, size=(LARGURA_TELA, cache_hud.altura),
+            pos=(0, ALTURA_TELA - cache_hud.altura))
+
+def desenhar_fim_jogo(tela):
+    tela.fill((0, 0, 0))
     
     if jogo.jogador.vida <= 0:
-        screen.draw.text("FIM DE JOGO", center=(LARGURA_TELA//2, ALTURA_TELA//2 - 60), 
-                        fontsize=42, color=(255, 100, 100))
+        tela.draw.text("FIM DE JOGO", center=(LARGURA_TELA//2, ALTURA_TELA//2 - 60), 
+                      fontsize=42, color=(255, 100, 100))
     else:
-        screen.draw.text("VITÓRIA!", center=(LARGURA_TELA//2, ALTURA_TELA//2 - 60), 
-                        fontsize=42, color=(100, 255, 100))
+        tela.draw.text("VITÓRIA!", center=(LARGURA_TELA//2, ALTURA_TELA//2 - 60), 
+                      fontsize=42, color=(100, 255, 100))
     
-    screen.draw.text(f"Pontuação Final: {jogo.jogador.pontuacao}", 
-                    center=(LARGURA_TELA//2, ALTURA_TELA//2 - 10), 
-                    fontsize=28, color="white")
+    tela.draw.text(f"Pontuação Final: {jogo.jogador.pontuacao}", 
+                  center=(LARGURA_TELA//2, ALTURA_TELA//2 - 10), 
+                  fontsize=28, color="white")
     
-    screen.draw.text("Pressione ESPAÇO para voltar ao menu", 
-                    center=(LARGURA_TELA//2, ALTURA_TELA//2 + 40), 
-                    fontsize=20, color=(200, 200, 200))
+    tela.draw.text("Pressione ESPAÇO para voltar ao menu", 
+                  center=(LARGURA_TELA//2, ALTURA_TELA//2 + 40), 
+                  fontsize=20, color=(200, 200, 200))
 
 def on_mouse_down(pos):
     if jogo.estado == ESTADO_MENU:
-        botao_iniciar = Rect(LARGURA_TELA//2 - 100, 180, 200, 50)
-        botao_musica = Rect(LARGURA_TELA//2 - 100, 250, 200, 50)
-        botao_sair = Rect(LARGURA_TELA//2 - 100, 320, 200, 50)
-        
-        if botao_iniciar.collidepoint(pos):
+        if BOTAO_INICIAR.collidepoint(pos):
             jogo.estado = ESTADO_JOGANDO
             jogo.reiniciar_jogo()
-        elif botao_musica.collidepoint(pos):
+        elif BOTAO_MUSICA.collidepoint(pos):
             jogo.alternar_musica()
-        elif botao_sair.collidepoint(pos):
+        elif BOTAO_SAIR.collidepoint(pos):
             quit()
 
 def on_key_down(key):
@@ -583,10 +1007,45 @@ def on_key_up(key):
         elif key == keys.DOWN:
             teclas_pressionadas['baixo'] = False
 
+def entrada_aleatoria(quadro, jogo):
+    """Entrada sintética: segura uma direção aleatória a cada 20 quadros"""
+    if quadro % 20:
+        return {}
+    direcao = random.choice(list(teclas_pressionadas))
+    return {tecla: tecla == direcao for tecla in teclas_pressionadas}
+
+def executar_simulacao(argumentos):
+    """Uso: python main.py --simular [QUADROS] [--dt SEGUNDOS] [--enxame]"""
+    indice = argumentos.index('--simular')
+    quadros = 10000
+    if indice + 1 < len(argumentos) and argumentos[indice + 1].isdigit():
+        quadros = int(argumentos[indice + 1])
+    dt = 1/60
+    if '--dt' in argumentos:
+        dt = float(argumentos[argumentos.index('--dt') + 1])
+    
+    jogo.musica_ativada = False
+    if '--enxame' in argumentos:
+        jogo.usar_enxame = True
+        jogo.reiniciar_jogo()
+    inicio = time.perf_counter()
+    niveis = jogo.simular(quadros, dt, entrada_aleatoria)
+    duracao = time.perf_counter() - inicio
+    
+    print(f"🕹️  {quadros} quadros simulados em {duracao:.2f}s "
+          f"({quadros / duracao:.0f} quadros/s, {quadros * dt / duracao:.0f}x tempo real)")
+    print(f"🗺️  Níveis gerados: {niveis}")
+
 # Configuração do pgzero
 WIDTH = LARGURA_TELA
 HEIGHT = ALTURA_TELA
 TITLE = "Explorador de Masmorras"
+REDRAW_ON_DEMAND = True
+# A lógica roda a passo fixo, independente da taxa de quadros
+UPDATE_RATE = 60
 
 # Iniciar o jogo
-pgzrun.go()
\ No newline at end of file
+if MODO_SIMULACAO:
+    executar_simulacao(sys.argv)
+else:
+    pgzrun.go()
\ No newline at end of file
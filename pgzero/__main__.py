@@ -0,0 +1,3 @@
+from pgzero.runner import main
+
+main()
@@ -0,0 +1,14 @@
+# Expose clock API as a builtin
+from . import clock
+from . import music
+from . import tone
+from .actor import Actor
+from .keyboard import keyboard
+from .animation import animate
+from .rect import Rect, ZRect
+
+from .loaders import images, sounds
+
+from .constants import mouse, keys, keymods
+
+from .game import exit
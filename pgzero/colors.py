@@ -0,0 +1,77 @@
+"""Resolve colour names, hex strings and tuples to RGBA tuples.
+
+Parsing a colour such as ``'white'`` or ``'#ff8000'`` with ``pygame.Color``
+is slow compared to the drawing it is used for, and games tend to use the
+same few colours every frame. The resolver interns the results in a bounded
+table, so each distinct colour is parsed once.
+
+"""
+from collections import namedtuple
+
+import pygame
+
+__all__ = ['ColorResolver', 'ColorCacheInfo', 'resolver', 'resolve_color']
+
+
+#: Counters for a ColorResolver, in the style of functools' cache_info().
+ColorCacheInfo = namedtuple('ColorCacheInfo', 'hits misses size limit')
+
+
+class ColorResolver:
+    """Convert colours to RGBA tuples, remembering the results.
+
+    :param limit: The most colours to remember. When the table is full, the
+                  colour that was added first is forgotten.
+
+    """
+
+    def __init__(self, limit=256):
+        self.limit = limit
+        self.hits = 0
+        self.misses = 0
+        self._table = {}
+
+    def resolve(self, color):
+        """Return color as an (r, g, b, a) tuple.
+
+        :param color: A colour name, a hex string such as ``'#ff8000'``, a
+                      tuple of 3 or 4 integers, or a ``pygame.Color``.
+        :raises ValueError: If color is not a valid colour.
+
+        """
+        try:
+            resolved = self._table[color]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable, eg. a pygame.Color or a list; these can't be
+            # interned, but are quick to convert anyway
+            self.misses += 1
+            return tuple(pygame.Color(color))
+        else:
+            self.hits += 1
+            return resolved
+
+        self.misses += 1
+        resolved = tuple(pygame.Color(color))
+        table = self._table
+        if len(table) >= self.limit:
+            del table[next(iter(table))]
+        table[color] = resolved
+        return resolved
+
+    def info(self):
+        """Return a ColorCacheInfo with the resolver's counters."""
+        return ColorCacheInfo(
+            self.hits, self.misses, len(self._table), self.limit
+        )
+
+    def clear(self):
+        """Forget all remembered colours and reset the counters."""
+        self._table.clear()
+        self.hits = self.misses = 0
+
+
+# The resolver shared by the screen and text drawing functions
+resolver = ColorResolver()
+resolve_color = resolver.resolve
@@ -0,0 +1,691 @@
+import math
+import sys
+import time
+from collections import namedtuple
+from types import ModuleType
+
+import pygame
+import pgzero.clock
+import pgzero.keyboard
+import pgzero.pacer
+import pgzero.screen
+import pgzero.watchdog
+
+from . import constants
+
+
+screen = None
+DISPLAY_FLAGS = 0
+
+# In dirty-rectangle mode (DIRTY_RECTS = True in the game module), fall back
+# to a full flip when the dirty regions cover more than this fraction of the
+# window; beyond that, presenting many small rects costs more than one flip.
+DIRTY_RECTS_FLIP_FRACTION = 0.5
+
+# With REDRAW_ON_DEMAND = True in the game module, frames where nothing asked
+# for a redraw are skipped, and the loop sleeps until input arrives, waking at
+# least this many times per second (overridable with IDLE_FPS).
+DEFAULT_IDLE_FPS = 10
+
+# Target frame rate when the game module doesn't set FPS. Set FPS = None (or
+# 0) for an uncapped loop, and FRAME_PACING = 'hybrid' for low-jitter pacing.
+DEFAULT_FPS = 60
+
+# While the window is unfocused or minimised, the loop runs at this frame
+# rate (overridable with BACKGROUND_FPS; set it to None or 0 to keep the
+# normal rate). Nothing is drawn while the window is minimised or hidden.
+DEFAULT_BACKGROUND_FPS = 10
+
+# With UPDATE_RATE set in the game module, update() is called with a fixed
+# dt of 1 / UPDATE_RATE, as many times as needed to keep up with real time
+# but at most MAX_UPDATES_PER_FRAME times per frame; beyond that, the
+# simulation slows down rather than stalling the display.
+DEFAULT_MAX_UPDATES_PER_FRAME = 5
+
+# The loop tells SDL to drop events that the game has no handler for (unless
+# the game module sets FILTER_EVENTS = False); these are always let through,
+# for quitting, keyboard state tracking and window management.
+ALWAYS_ALLOWED_EVENTS = frozenset(
+    [
+        pygame.QUIT,
+        pygame.KEYDOWN,
+        pygame.KEYUP,
+        pygame.ACTIVEEVENT,
+        pygame.VIDEORESIZE,
+        pygame.VIDEOEXPOSE,
+    ] + [
+        getattr(pygame, name) for name in dir(pygame)
+        if name.startswith('WINDOW') and isinstance(getattr(pygame, name), int)
+    ]
+)
+
+#: How many events the last frame received from SDL, and how many of them
+#: were passed to a handler. With COALESCE_MOUSE_MOTION = True in the game
+#: module, each run of consecutive MOUSEMOTION events is merged into one
+#: before dispatch, so dispatched can be much lower than received.
+EventCounts = namedtuple('EventCounts', 'received dispatched')
+
+# Setting HITCH_BUDGET (in seconds) in the game module starts a watchdog that
+# samples the stack during frames that take longer, and logs them to
+# HITCH_LOG; see pgzero.watchdog.
+DEFAULT_HITCH_LOG = 'hitches.log'
+
+# Game module settings that affect the window. These are only re-read when
+# they are known to have changed: see configure(). Unlike older versions,
+# rebinding one with ``global`` inside the game module is not noticed
+# without a following configure() call.
+SCREEN_SETTINGS = frozenset(('WIDTH', 'HEIGHT', 'TITLE', 'ICON'))
+_game = None
+_screen_settings_changed = True
+# Settings passed to configure() before the game was created
+_pending_settings = {}
+
+
+def exit():
+    """Wait for up to a second for all sounds to play out
+    and then exit
+    """
+    t0 = time.time()
+    while pygame.mixer.get_busy():
+        time.sleep(0.1)
+        if time.time() - t0 > 1.0:
+            break
+    sys.exit()
+
+
+def event_counts():
+    """Return the EventCounts for the last frame of the running game."""
+    return _game.event_counts
+
+
+def positional_parameters(handler):
+    """Get the positional parameters of the given function."""
+    code = handler.__code__
+    return code.co_varnames[:code.co_argcount]
+
+
+class DEFAULTICON:
+    """Sentinel indicating that we want to use the default icon."""
+
+
+def configure(**settings):
+    """Change the window settings of the running game.
+
+    For example::
+
+        configure(WIDTH=1024, HEIGHT=768, TITLE="Level 2")
+
+    Each setting is assigned on the game module, and the window is updated
+    before the next frame is drawn. Assigning a setting from outside the game
+    module (``game_module.TITLE = ...``) has the same effect. Rebinding one
+    inside the game module with ``global`` cannot be detected, so call
+    ``configure()`` with no arguments afterwards.
+
+    It may also be called from the top level of the game module, before the
+    game has been created; the settings are then applied when it is.
+
+    """
+    global _screen_settings_changed
+    unknown = set(settings) - SCREEN_SETTINGS
+    if unknown:
+        raise TypeError(
+            "configure() got unexpected settings: %s (expected %s)" % (
+                ', '.join(sorted(unknown)), ', '.join(sorted(SCREEN_SETTINGS))
+            )
+        )
+    if _game is None:
+        _pending_settings.update(settings)
+    else:
+        for name, value in settings.items():
+            setattr(_game.mod, name, value)
+    _screen_settings_changed = True
+
+
+class WatchedModule(ModuleType):
+    """A module type that notices when window settings are assigned.
+
+    Only assignments through the module object are seen. A ``global TITLE``
+    rebind inside the game module's own functions writes to its namespace
+    directly, so it takes effect only after a call to :func:`configure`.
+
+    """
+
+    def __setattr__(self, name, value):
+        global _screen_settings_changed
+        super().__setattr__(name, value)
+        if name in SCREEN_SETTINGS:
+            _screen_settings_changed = True
+
+
+class PGZeroGame:
+    def __init__(self, mod):
+        global _game, _screen_settings_changed
+        if type(mod) is ModuleType:
+            mod.__class__ = WatchedModule
+        self.mod = mod
+        for name, value in _pending_settings.items():
+            setattr(mod, name, value)
+        _pending_settings.clear()
+        self.screen = None
+        self.width = None
+        self.height = None
+        self.title = None
+        self.icon = None
+        self.keyboard = pgzero.keyboard.keyboard
+        self.handlers = {}
+        self.event_counts = EventCounts(0, 0)
+        self.started = False
+        self.idle = False
+        self.focused = True
+        self.visible = True
+        _game = self
+        _screen_settings_changed = True
+
+    def reinit_screen(self):
+        """Reinitialise the window.
+
+        Return True if the dimensions of the screen changed.
+
+        """
+        global screen, _screen_settings_changed
+        _screen_settings_changed = False
+        changed = False
+        mod = self.mod
+
+        icon = getattr(self.mod, 'ICON', DEFAULTICON)
+        if icon and icon != self.icon:
+            if icon is DEFAULTICON:
+                self.show_default_icon()
+            else:
+                pygame.display.set_icon(pygame.image.load(icon))
+            self.icon = icon
+
+        w = getattr(mod, 'WIDTH', 800)
+        h = getattr(mod, 'HEIGHT', 600)
+        if w != self.width or h != self.height:
+            self.screen = pygame.display.set_mode((w, h), DISPLAY_FLAGS)
+            if hasattr(self.mod, 'screen'):
+                self.mod.screen.surface = self.screen
+                self.mod.screen.width, self.mod.screen.height = w, h
+            else:
+                self.mod.screen = pgzero.screen.Screen(self.screen)
+            screen = self.mod.screen
+            self.width = w
+            self.height = h
+            changed = True
+
+        title = getattr(self.mod, 'TITLE', 'Pygame Zero Game')
+        if title != self.title:
+            pygame.display.set_caption(title)
+            self.title = title
+
+        return changed
+
+    @staticmethod
+    def show_default_icon():
+        """Show a default icon loaded from Pygame Zero resources."""
+        from io import BytesIO
+        from pkgutil import get_data
+        buf = BytesIO(get_data(__name__, 'data/icon.png'))
+        pygame.display.set_icon(pygame.image.load(buf))
+
+    EVENT_HANDLERS = {
+        pygame.MOUSEBUTTONDOWN: 'on_mouse_down',
+        pygame.MOUSEBUTTONUP: 'on_mouse_up',
+        pygame.MOUSEMOTION: 'on_mouse_move',
+        pygame.KEYDOWN: 'on_key_down',
+        pygame.KEYUP: 'on_key_up',
+        constants.MUSIC_END: 'on_music_end',
+        pygame.WINDOWFOCUSLOST: 'on_focus_lost',
+        pygame.WINDOWFOCUSGAINED: 'on_focus_gained',
+        pygame.WINDOWMINIMIZED: 'on_minimize',
+        # Also sent when a maximised window is restored to its normal size
+        pygame.WINDOWRESTORED: 'on_restore',
+    }
+
+    # How window events change whether the game is focused and visible
+    WINDOW_STATE_EVENTS = {
+        pygame.WINDOWFOCUSLOST: ('focused', False),
+        pygame.WINDOWFOCUSGAINED: ('focused', True),
+        pygame.WINDOWMINIMIZED: ('visible', False),
+        pygame.WINDOWHIDDEN: ('visible', False),
+        pygame.WINDOWRESTORED: ('visible', True),
+        pygame.WINDOWSHOWN: ('visible', True),
+    }
+
+    # Sets of buttons for each distinct MOUSEMOTION 'buttons' tuple seen
+    _button_sets = {}
+
+    def map_buttons(val, _button_sets=_button_sets):
+        try:
+            buttons = _button_sets[val]
+        except KeyError:
+            buttons = _button_sets[val] = frozenset(
+                c for c, pressed in zip(constants.mouse, val) if pressed
+            )
+        return set(buttons)
+
+    EVENT_PARAM_MAPPERS = {
+        'buttons': map_buttons,
+    }
+
+    # Parameters whose raw values are looked up in a table. Values that
+    # aren't in the table (such as key codes that Pygame has no constant for)
+    # cause the handler to be skipped.
+    EVENT_PARAM_TABLES = {
+        'button': {m.value: m for m in constants.mouse},
+        'key': {k.value: k for k in constants.keys},
+    }
+
+    def load_handlers(self):
+        from .spellcheck import spellcheck
+        spellcheck(vars(self.mod))
+        self.handlers = {}
+        for type, name in self.EVENT_HANDLERS.items():
+            handler = getattr(self.mod, name, None)
+            if callable(handler):
+                self.handlers[type] = self.prepare_handler(handler)
+
+    def prepare_handler(self, handler):
+        """Adapt a pgzero game's raw handler function to take a Pygame Event.
+
+        Returns a one-argument function of the form ``handler(event)``.
+        This will ensure that the correct arguments are passed to the raw
+        handler based on its argument spec.
+
+        The wrapped handler will also map certain parameter values using
+        EVENT_PARAM_TABLES and EVENT_PARAM_MAPPERS; this ensures that the
+        value of 'button' inside the handler is a real instance of
+        constants.mouse, which means (among other things) that it will print
+        as a symbolic value rather than a naive integer.
+
+        Because this runs for every event, the adapter is generated as
+        source code specialised for the handler's parameters, which are
+        passed positionally.
+
+        """
+        code = handler.__code__
+        param_names = code.co_varnames[:code.co_argcount]
+
+        namespace = {'handler': handler}
+        lines = ['def adapter(event):']
+        args = []
+        for i, name in enumerate(param_names):
+            arg = 'arg%d' % i
+            args.append(arg)
+            if name in self.EVENT_PARAM_TABLES:
+                table = 'table%d' % i
+                namespace[table] = self.EVENT_PARAM_TABLES[name]
+                lines += [
+                    '    %s = %s.get(event.%s)' % (arg, table, name),
+                    '    if %s is None:' % arg,
+                    # Skip events we have no constant for; Pygame can
+                    # generate key codes that it does not have constants for
+                    '        return',
+                ]
+            elif name in self.EVENT_PARAM_MAPPERS:
+                mapper = 'mapper%d' % i
+                namespace[mapper] = self.EVENT_PARAM_MAPPERS[name]
+                lines.append('    %s = %s(event.%s)' % (arg, mapper, name))
+            else:
+                lines.append('    %s = event.%s' % (arg, name))
+        lines.append('    return handler(%s)' % ', '.join(args))
+
+        exec('\n'.join(lines), namespace)
+        return namespace['adapter']
+
+    def filter_events(self):
+        """Stop SDL from queueing events that no handler will receive."""
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(
+            list(ALWAYS_ALLOWED_EVENTS | self.handlers.keys())
+        )
+
+    @staticmethod
+    def coalesce_motion(events):
+        """Merge each run of consecutive MOUSEMOTION events into one.
+
+        The merged event has the position and buttons of the last event in
+        the run, and the sum of their ``rel`` movements.
+
+        """
+        merged = []
+        for event in events:
+            if event.type == pygame.MOUSEMOTION and merged \
+                    and merged[-1].type == pygame.MOUSEMOTION:
+                rx, ry = merged[-1].rel
+                dx, dy = event.rel
+                merged[-1] = pygame.event.Event(
+                    pygame.MOUSEMOTION,
+                    event.dict,
+                    rel=(rx + dx, ry + dy),
+                )
+            else:
+                merged.append(event)
+        return merged
+
+    def dispatch_event(self, event):
+        """Pass event to its handler; return True if there was one."""
+        handler = self.handlers.get(event.type)
+        if handler:
+            self.need_redraw = True
+            handler(event)
+            return True
+        return False
+
+    def get_update_func(self):
+        """Get a one-argument update function.
+
+        If the module defines a function matching ::
+
+            update(dt)
+
+        or ::
+
+            update()
+
+        then this will be called. Otherwise return a no-op function.
+
+        """
+        try:
+            update = self.mod.update
+        except AttributeError:
+            return None
+        else:
+            if update.__code__.co_argcount == 0:
+                return lambda dt: update()
+            return update
+
+    def get_draw_func(self):
+        """Get a one-argument draw function.
+
+        If the module defines a function matching ::
+
+            draw(alpha)
+
+        or ::
+
+            draw()
+
+        then this will be called. ``alpha`` is how far (from 0 to 1) the
+        current time is between the last fixed-rate update and the next one,
+        for interpolating positions when ``UPDATE_RATE`` is set; otherwise it
+        is always 1.
+
+        If no draw function is defined, return a no-op function.
+
+        """
+        try:
+            draw = self.mod.draw
+        except AttributeError:
+            return lambda alpha: None
+        else:
+            argcount = draw.__code__.co_argcount
+            if argcount == 0:
+                return lambda alpha: draw()
+            if argcount != 1:
+                raise TypeError(
+                    "draw() must take no arguments, or just alpha."
+                )
+            return draw
+
+    def present(self, full=False):
+        """Show the frame that has just been drawn.
+
+        If the screen is recording dirty regions, only those are updated,
+        unless they cover most of the window or ``full`` is True, in which
+        case the whole display is flipped.
+
+        """
+        dirty = self.mod.screen._take_dirty()
+        if dirty is None or full:
+            pygame.display.flip()
+            return
+        if not dirty:
+            return
+
+        bounds = self.screen.get_rect()
+        rects = []
+        area = 0
+        for r in dirty:
+            r = bounds.clip(r)
+            if r.width and r.height:
+                rects.append(r)
+                area += r.width * r.height
+
+        if area > DIRTY_RECTS_FLIP_FRACTION * bounds.width * bounds.height:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    @staticmethod
+    def wait_events(timeout):
+        """Sleep until an event arrives or timeout seconds have passed.
+
+        Return a list of all pending events.
+
+        """
+        first = pygame.event.wait(max(1, int(timeout * 1000)))
+        events = [] if first.type == pygame.NOEVENT else [first]
+        events.extend(pygame.event.get())
+        return events
+
+    def run(self):
+        """Invoke the main loop, and then clean up."""
+        try:
+            self.mainloop()
+        finally:
+            pygame.display.quit()
+            pygame.mixer.quit()
+
+    @property
+    def background(self):
+        """True if the window is unfocused, minimised or hidden."""
+        return not (self.focused and self.visible)
+
+    def start(self):
+        """Prepare the game to run, ready for calls to step().
+
+        mainloop() calls this itself; call it directly only to drive the
+        game frame by frame.
+
+        """
+        self.fps = getattr(self.mod, 'FPS', DEFAULT_FPS)
+        self.frame_pacing = getattr(self.mod, 'FRAME_PACING', 'sleep')
+        pgzero.pacer.pacer.configure(self.fps, self.frame_pacing)
+        self.reinit_screen()
+        if getattr(self.mod, 'DIRTY_RECTS', False):
+            self.mod.screen._track_dirty()
+            # The first frame must present the whole window
+            self.mod.screen._mark_dirty(self.screen.get_rect())
+
+        self.update_func = self.get_update_func()
+        self.draw_func = self.get_draw_func()
+        self.load_handlers()
+        if getattr(self.mod, 'FILTER_EVENTS', True):
+            self.filter_events()
+        self.coalesce = getattr(self.mod, 'COALESCE_MOUSE_MOTION', False)
+
+        self.on_demand = getattr(self.mod, 'REDRAW_ON_DEMAND', False)
+        update_rate = getattr(self.mod, 'UPDATE_RATE', None)
+        self.fixed_dt = 1.0 / update_rate if update_rate else None
+        self.max_updates = getattr(
+            self.mod, 'MAX_UPDATES_PER_FRAME', DEFAULT_MAX_UPDATES_PER_FRAME
+        )
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.animating = False
+        self.idle_wait = 1.0 / getattr(
+            self.mod, 'IDLE_FPS', DEFAULT_IDLE_FPS
+        )
+
+        self.need_redraw = True
+        self.need_flip = True
+        self.idle = False
+
+        budget = getattr(self.mod, 'HITCH_BUDGET', None)
+        self.watchdog = None
+        if budget:
+            self.watchdog = pgzero.watchdog.HitchWatchdog(
+                budget, getattr(self.mod, 'HITCH_LOG', DEFAULT_HITCH_LOG)
+            )
+        self.started = True
+
+    def step(self, dt, events=None, draw=True, flip=True, throttled=False):
+        """Run a single frame of the game.
+
+        This handles events, advances the clock and calls update() and
+        draw(), without any waiting; mainloop() is built on it. Calling it
+        with a fixed ``dt`` runs the game deterministically, as fast as the
+        CPU allows, for example from a test harness or benchmark::
+
+            game.start()
+            for i in range(600):
+                game.step(1 / 60, draw=False)
+
+        :param dt: The time in seconds to advance the game by.
+        :param events: A list of the events to handle this frame, which may
+                       include synthetic ``pygame.event.Event`` objects. If
+                       None, pending events are read from Pygame's queue.
+        :param draw: If False, skip drawing (and showing) the frame. Frames
+                     are never drawn while the window is minimised or hidden.
+        :param flip: If False, draw the frame on the screen surface but don't
+                     show it on the display.
+        :param throttled: True if ``dt`` was stretched on purpose to run at
+                          BACKGROUND_FPS; all of it is then caught up on,
+                          even beyond MAX_UPDATES_PER_FRAME.
+        :return: False if the game received a QUIT event, otherwise True.
+
+        """
+        if not self.started:
+            self.start()
+        if events is None:
+            events = pygame.event.get()
+
+        received = len(events)
+        if self.coalesce and received > 1:
+            events = self.coalesce_motion(events)
+        dispatched = 0
+        for event in events:
+            if event.type == pygame.QUIT:
+                return False
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_q and \
+                        event.mod & (pygame.KMOD_CTRL | pygame.KMOD_META):
+                    sys.exit(0)
+                self.keyboard._press(event.key)
+            elif event.type == pygame.KEYUP:
+                self.keyboard._release(event.key)
+            elif event.type in self.WINDOW_STATE_EVENTS:
+                attr, value = self.WINDOW_STATE_EVENTS[event.type]
+                setattr(self, attr, value)
+                if attr == 'visible' and value:
+                    # The window contents may have been lost while hidden
+                    self.need_redraw = self.need_flip = True
+            dispatched += self.dispatch_event(event)
+        self.event_counts = EventCounts(received, dispatched)
+
+        watchdog = self.watchdog
+        if watchdog:
+            watchdog.phase = 'clock'
+        pgzclock = pgzero.clock.clock
+        pgzclock.tick(dt)
+
+        if watchdog:
+            watchdog.phase = 'update'
+        update = self.update_func
+        fixed_dt = self.fixed_dt
+        steps = 0
+        if update and fixed_dt:
+            self.accumulator += dt
+            max_updates = self.max_updates
+            if self.idle:
+                # The time since the last frame was spent sleeping on
+                # purpose, so catch up on all of it
+                max_updates += int(self.idle_wait / fixed_dt) + 1
+            if throttled:
+                # Likewise for frames slowed down in the background, so the
+                # game doesn't lose time while unfocused
+                max_updates = max(max_updates, math.ceil(dt / fixed_dt))
+            while self.accumulator >= fixed_dt and steps < max_updates:
+                update(fixed_dt)
+                self.accumulator -= fixed_dt
+                steps += 1
+            # Drop any whole steps we couldn't catch up on
+            self.accumulator %= fixed_dt
+            self.alpha = self.accumulator / fixed_dt
+        elif update:
+            update(dt)
+
+        if _screen_settings_changed and self.reinit_screen():
+            self.need_redraw = self.need_flip = True
+        invalidated = self.mod.screen._take_invalidated()
+        if steps:
+            # With fixed steps, many frames run no update at all. While the
+            # updates keep asking for redraws, draw those frames too (with
+            # the new alpha), rather than letting the loop go idle
+            self.animating = invalidated
+        redraw = (
+            pgzclock.fired
+            or self.need_redraw
+            or invalidated
+            or self.animating
+        )
+        if draw and self.visible and (
+                redraw or (update and not self.on_demand)):
+            if watchdog:
+                watchdog.phase = 'draw'
+            self.draw_func(self.alpha)
+            self.need_redraw = False
+            if flip:
+                if watchdog:
+                    watchdog.phase = 'present'
+                self.present(full=self.need_flip)
+                self.need_flip = False
+        self.idle = self.on_demand and not redraw
+        return True
+
+    def mainloop(self):
+        """Run the main loop of Pygame Zero."""
+        self.start()
+        pacer = pgzero.pacer.pacer
+        pgzclock = pgzero.clock.clock
+        background_fps = getattr(
+            self.mod, 'BACKGROUND_FPS', DEFAULT_BACKGROUND_FPS
+        )
+        throttled = False
+
+        watchdog = self.watchdog
+        if watchdog:
+            watchdog.start()
+        try:
+            while True:
+                if self.idle:
+                    # Nothing changed last frame; sleep until there is input,
+                    # or the next scheduled clock event is due
+                    wait = self.idle_wait
+                    if pgzclock.events:
+                        wait = min(wait, pgzclock.events[0].time - pgzclock.t)
+                    events = self.wait_events(wait)
+                    dt = pacer.tick(wait=False)
+                else:
+                    dt = pacer.tick()
+                    events = pygame.event.get()
+
+                if watchdog:
+                    watchdog.arm()
+                running = self.step(dt, events, throttled=throttled)
+                if watchdog:
+                    watchdog.disarm()
+                if not running:
+                    return
+
+                if background_fps and self.background != throttled:
+                    throttled = self.background
+                    pacer.configure(
+                        background_fps if throttled else self.fps,
+                        self.frame_pacing,
+                    )
+        finally:
+            if watchdog:
+                watchdog.stop()
@@ -0,0 +1,137 @@
+"""Frame pacing for the game loop.
+
+The pacer keeps the main loop running at a target frame rate and records
+how long frames take, so that games can check how close they are to their
+frame budget.
+
+"""
+import time
+from collections import deque, namedtuple
+
+__all__ = ['FramePacer', 'FrameStats', 'pacer']
+
+
+#: Frame time statistics, in seconds (``missed`` and ``frames`` are counts).
+FrameStats = namedtuple('FrameStats', 'mean p95 p99 missed frames')
+
+
+def percentile(ordered, fraction):
+    """Return the value at the given fraction of a sorted, non-empty list."""
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class FramePacer:
+    """Wait between frames so that they start at a fixed rate.
+
+    :param fps: The target frame rate. ``None`` or 0 means uncapped: tick()
+                never waits.
+    :param mode: ``'sleep'`` to sleep until the next frame is due, or
+                 ``'hybrid'`` to sleep until shortly before it and then spin
+                 on the high-resolution timer. Hybrid mode uses more CPU but
+                 starts frames with much less jitter.
+    :param spin: In hybrid mode, how many seconds before the deadline to stop
+                 sleeping and start spinning.
+    :param history: How many recent frame times to keep for statistics.
+
+    """
+    MODES = ('sleep', 'hybrid')
+
+    def __init__(self, fps=60, mode='sleep', spin=0.002, history=240):
+        self.spin = spin
+        self.times = deque(maxlen=history)
+        self.missed = 0
+        self.frames = 0
+        self._last = None
+        self._deadline = None
+        self.configure(fps, mode)
+
+    def configure(self, fps=60, mode='sleep'):
+        """Change the target frame rate and pacing mode."""
+        if mode not in self.MODES:
+            raise ValueError(
+                "Unknown frame pacing mode %r (expected one of %s)" % (
+                    mode, ', '.join(repr(m) for m in self.MODES)
+                )
+            )
+        if fps is not None and fps < 0:
+            raise ValueError("FPS must not be negative")
+        self.fps = fps
+        self.mode = mode
+        self.period = 1.0 / fps if fps else 0.0
+        self._deadline = None
+
+    def reset(self):
+        """Forget all recorded frame times."""
+        self.times.clear()
+        self.missed = 0
+        self.frames = 0
+
+    def _wait_until(self, deadline):
+        remaining = deadline - time.perf_counter()
+        if self.mode == 'hybrid':
+            if remaining > self.spin:
+                time.sleep(remaining - self.spin)
+            while time.perf_counter() < deadline:
+                pass
+        elif remaining > 0:
+            time.sleep(remaining)
+
+    def tick(self, wait=True):
+        """Wait until the next frame is due and return the elapsed time.
+
+        :param wait: If False, don't wait, just measure the time since the
+                     last tick. Such frames are not included in the
+                     statistics; the game loop uses this after it has
+                     deliberately slept, for example while idle.
+        :return: The time in seconds since the previous tick (0 on the first
+                 call).
+
+        """
+        if wait and self.period:
+            if self._deadline is None:
+                self._deadline = time.perf_counter()
+            deadline = self._deadline + self.period
+            now = time.perf_counter()
+            if now < deadline:
+                self._wait_until(deadline)
+                self._deadline = deadline
+            else:
+                # We're late; start counting again from now rather than
+                # trying to catch up with a burst of short frames
+                self.missed += 1
+                self._deadline = now
+        else:
+            self._deadline = None
+
+        now = time.perf_counter()
+        dt = 0.0 if self._last is None else now - self._last
+        self._last = now
+        if wait and dt:
+            self.times.append(dt)
+            self.frames += 1
+        return dt
+
+    def stats(self):
+        """Return a FrameStats for the recently recorded frames.
+
+        ``mean``, ``p95`` and ``p99`` cover the last ``history`` frames;
+        ``missed`` counts the frames that started late since the last
+        reset().
+
+        """
+        if not self.times:
+            return FrameStats(0.0, 0.0, 0.0, self.missed, self.frames)
+        ordered = sorted(self.times)
+        return FrameStats(
+            sum(ordered) / len(ordered),
+            percentile(ordered, 0.95),
+            percentile(ordered, 0.99),
+            self.missed,
+            self.frames,
+        )
+
+
+# The pacer used by the game loop; it is configured from the FPS and
+# FRAME_PACING settings of the game module
+pacer = FramePacer()
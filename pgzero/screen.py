@@ -0,0 +1,802 @@
+import weakref
+from contextlib import contextmanager
+
+import pygame
+import pygame.draw
+from . import ptext
+from .rect import RECT_CLASSES
+from . import loaders
+from .colors import resolve_color
+
+
+def round_pos(pos):
+    """Round a tuple position so it can be used for drawing."""
+    x, y = pos
+    return round(x), round(y)
+
+
+def make_color(arg):
+    """Return arg as a colour tuple; names are looked up once and reused."""
+    if isinstance(arg, tuple):
+        return arg
+    return resolve_color(arg)
+
+
+class Camera:
+    """The part of the game world that is shown on the screen.
+
+    Positions given to ``screen.draw``, ``screen.blit()``, ``Actor.draw()``
+    and the other drawing methods are in world coordinates. The camera
+    subtracts its own position from them, then scales by its zoom. Anything
+    that would land entirely outside the screen is skipped before it reaches
+    Pygame, so drawing the whole of a large map costs little more than
+    drawing the part in view. Text follows the camera too, with its font
+    size scaled by the zoom; only ``screen.fill()`` is not affected. Draw a
+    HUD inside :meth:`suspended` to place it in screen coordinates.
+
+    At the default position of (0, 0) and zoom of 1, world coordinates are
+    screen coordinates and drawing is exactly as if there were no camera.
+
+    Images blitted at a zoom above 1 are scaled once and the scaled copy is
+    reused; call :meth:`forget` after drawing onto such an image.
+
+    """
+
+    def __init__(self, screen):
+        self._screen = screen
+        self._x = 0
+        self._y = 0
+        self._zoom = 1
+        self._suspended = 0
+        self._scaled = weakref.WeakKeyDictionary()
+        #: False if the camera leaves all positions unchanged
+        self.active = False
+
+    def _update(self):
+        self.active = not self._suspended and (
+            self._x != 0 or self._y != 0 or self._zoom != 1
+        )
+
+    @property
+    def x(self):
+        """The world x coordinate shown at the left edge of the screen."""
+        return self._x
+
+    @x.setter
+    def x(self, x):
+        self._x = x
+        self._update()
+
+    @property
+    def y(self):
+        """The world y coordinate shown at the top edge of the screen."""
+        return self._y
+
+    @y.setter
+    def y(self, y):
+        self._y = y
+        self._update()
+
+    @property
+    def pos(self):
+        """The world position shown at the top left of the screen."""
+        return self._x, self._y
+
+    @pos.setter
+    def pos(self, pos):
+        self._x, self._y = pos
+        self._update()
+
+    @property
+    def zoom(self):
+        """How many screen pixels each world pixel covers; a whole number."""
+        return self._zoom
+
+    @zoom.setter
+    def zoom(self, zoom):
+        if not isinstance(zoom, int) or zoom < 1:
+            raise ValueError("Camera zoom must be a positive whole number")
+        self._zoom = zoom
+        self._update()
+
+    def center_on(self, pos):
+        """Move the camera so that the world position pos is centred."""
+        x, y = pos
+        zoom = self._zoom
+        self.pos = (
+            x - self._screen.width / (2 * zoom),
+            y - self._screen.height / (2 * zoom),
+        )
+
+    def to_screen(self, pos):
+        """Convert a world position to a screen position."""
+        x, y = pos
+        zoom = self._zoom
+        return round((x - self._x) * zoom), round((y - self._y) * zoom)
+
+    def to_world(self, pos):
+        """Convert a screen position, such as the mouse's, to the world."""
+        x, y = pos
+        zoom = self._zoom
+        return x / zoom + self._x, y / zoom + self._y
+
+    @contextmanager
+    def suspended(self):
+        """Draw in screen coordinates inside a ``with`` block."""
+        self._suspended += 1
+        self._update()
+        try:
+            yield self
+        finally:
+            self._suspended -= 1
+            self._update()
+
+    def forget(self, image=None):
+        """Discard the scaled copy of image, or of all images."""
+        if image is None:
+            self._scaled.clear()
+        else:
+            self._scaled.pop(image, None)
+
+    def _visible(self, x, y, w, h):
+        """Return True if the screen rect (x, y, w, h) is at all on screen."""
+        screen = self._screen
+        return x + w > 0 and y + h > 0 and x < screen.width and \
+            y < screen.height
+
+    def _line(self, start, end):
+        """Transform a line, returning (start, end, width), or None."""
+        zoom = self._zoom
+        (x0, y0), (x1, y1) = self.to_screen(start), self.to_screen(end)
+        if not self._visible(
+                min(x0, x1) - zoom, min(y0, y1) - zoom,
+                abs(x1 - x0) + 2 * zoom, abs(y1 - y0) + 2 * zoom):
+            return None
+        return (x0, y0), (x1, y1), zoom
+
+    def _circle(self, pos, radius):
+        """Transform a circle, returning (pos, radius, width), or None."""
+        zoom = self._zoom
+        x, y = self.to_screen(pos)
+        radius *= zoom
+        if not self._visible(x - radius, y - radius, 2 * radius, 2 * radius):
+            return None
+        return (x, y), radius, zoom
+
+    def _rect(self, rect):
+        """Transform a rect, returning (rect, width), or None."""
+        zoom = self._zoom
+        x, y = self.to_screen((rect.x, rect.y))
+        w = round(rect.w * zoom)
+        h = round(rect.h * zoom)
+        if not self._visible(x, y, w, h):
+            return None
+        return pygame.Rect(x, y, w, h), zoom
+
+    # ptext.draw() keyword arguments that give positions and distances
+    TEXT_POINTS = (
+        'pos', 'topleft', 'bottomleft', 'topright', 'bottomright',
+        'midtop', 'midleft', 'midbottom', 'midright', 'center',
+    )
+    TEXT_XS = ('left', 'right', 'centerx')
+    TEXT_YS = ('top', 'bottom', 'centery')
+
+    def _text(self, args, kwargs):
+        """Transform the arguments of ptext.draw() to screen coordinates."""
+        zoom = self._zoom
+        if len(args) > 1:
+            args = (args[0], self.to_screen(args[1])) + args[2:]
+        kwargs = dict(kwargs)
+        for name in self.TEXT_POINTS:
+            if kwargs.get(name) is not None:
+                kwargs[name] = self.to_screen(kwargs[name])
+        for name in self.TEXT_XS:
+            if kwargs.get(name) is not None:
+                kwargs[name] = round((kwargs[name] - self._x) * zoom)
+        for name in self.TEXT_YS:
+            if kwargs.get(name) is not None:
+                kwargs[name] = round((kwargs[name] - self._y) * zoom)
+        if zoom != 1:
+            fontsize = kwargs.get('fontsize')
+            if fontsize is None:
+                fontsize = ptext.DEFAULT_FONT_SIZE
+            kwargs['fontsize'] = fontsize * zoom
+            if kwargs.get('width') is not None:
+                kwargs['width'] *= zoom
+        return args, kwargs
+
+    def _blit(self, image, pos):
+        """Transform a blit, returning (image, pos), or None."""
+        if isinstance(pos, RECT_CLASSES):
+            pos = pos.topleft
+        x, y = self.to_screen(pos)
+        zoom = self._zoom
+        w, h = image.get_size()
+        if not self._visible(x, y, w * zoom, h * zoom):
+            return None
+        if zoom != 1:
+            image = self._scale(image)
+        return image, (x, y)
+
+    def _scale(self, image):
+        zoom = self._zoom
+        try:
+            scaled_zoom, scaled = self._scaled[image]
+        except KeyError:
+            pass
+        else:
+            if scaled_zoom == zoom:
+                return scaled
+        w, h = image.get_size()
+        scaled = pygame.transform.scale(image, (w * zoom, h * zoom))
+        self._scaled[image] = zoom, scaled
+        return scaled
+
+
+class SurfacePainter:
+    """Interface to pygame.draw that is bound to a surface."""
+
+    def __init__(self, screen):
+        self._screen = screen
+
+    @property
+    def _surf(self):
+        return self._screen.surface
+
+    def line(self, start, end, color):
+        """Draw a line from start to end."""
+        camera = self._screen.camera
+        if camera.active:
+            line = camera._line(start, end)
+            if line is None:
+                return
+            start, end, width = line
+        else:
+            start = round_pos(start)
+            end = round_pos(end)
+            width = 1
+        self._screen._mark_dirty(
+            pygame.draw.line(self._surf, make_color(color), start, end, width)
+        )
+
+    def _circle(self, pos, radius, color, filled):
+        camera = self._screen.camera
+        if camera.active:
+            circle = camera._circle(pos, radius)
+            if circle is None:
+                return
+            pos, radius, width = circle
+        else:
+            pos = round_pos(pos)
+            width = 1
+        self._screen._mark_dirty(pygame.draw.circle(
+            self._surf, make_color(color), pos, radius, 0 if filled else width
+        ))
+
+    def circle(self, pos, radius, color):
+        """Draw a circle."""
+        self._circle(pos, radius, color, False)
+
+    def filled_circle(self, pos, radius, color):
+        """Draw a filled circle."""
+        self._circle(pos, radius, color, True)
+
+    def _rect(self, rect, color, filled):
+        camera = self._screen.camera
+        if camera.active:
+            transformed = camera._rect(rect)
+            if transformed is None:
+                return
+            rect, width = transformed
+        else:
+            width = 1
+        self._screen._mark_dirty(pygame.draw.rect(
+            self._surf, make_color(color), rect, 0 if filled else width
+        ))
+
+    def rect(self, rect, color):
+        """Draw a rectangle."""
+        if not isinstance(rect, RECT_CLASSES):
+            raise TypeError("screen.draw.rect() requires a rect to draw")
+        self._rect(rect, color, False)
+
+    def filled_rect(self, rect, color):
+        """Draw a filled rectangle."""
+        if not isinstance(rect, RECT_CLASSES):
+            raise TypeError("screen.draw.filled_rect() requires a rect to draw")
+        self._rect(rect, color, True)
+
+    def text(self, *args, **kwargs):
+        """Draw text to the screen."""
+        #FIXME: expose ptext parameters, for autocompletion and autodoc
+        camera = self._screen.camera
+        if camera.active:
+            # The text's size is only known once it has been rendered (and
+            # cached by ptext), so it is culled before blitting
+            args, kwargs = camera._text(args, kwargs)
+            tsurf, pos = ptext.draw(*args, surf=None, **kwargs)
+            if camera._visible(pos[0], pos[1], *tsurf.get_size()):
+                self._screen._mark_dirty(self._surf.blit(tsurf, pos))
+            return
+        tsurf, pos = ptext.draw(*args, surf=self._surf, **kwargs)
+        self._screen._mark_dirty(pygame.Rect(pos, tsurf.get_size()))
+
+    def textbox(self, *args, **kwargs):
+        """Draw text to the screen, wrapped to fit a box"""
+        #FIXME: expose ptext parameters, for autocompletion and autodoc
+        camera = self._screen.camera
+        if camera.active:
+            if len(args) > 1:
+                rect, args = args[1], args[:1] + args[2:]
+            else:
+                rect = kwargs.pop('rect')
+            transformed = camera._rect(pygame.Rect(rect))
+            if transformed is None:
+                return
+            args = args[:1] + (transformed[0],) + args[1:]
+        tsurf, pos = ptext.drawbox(*args, surf=self._surf, **kwargs)
+        self._screen._mark_dirty(pygame.Rect(pos, tsurf.get_size()))
+
+
+class DrawBatch:
+    """A buffer of drawing commands that are drawn on a screen together.
+
+    Recording a command only resolves its colour, and checks and stores its
+    arguments. Commands are drawn in the order they were recorded, when the
+    batch is submitted, and each run of consecutive blits is drawn with a
+    single ``Surface.blits()`` call. For example::
+
+        with screen.batch() as batch:
+            for rect in walls:
+                batch.filled_rect(rect, 'grey')
+            for image, pos in sprites:
+                batch.blit(image, pos)
+
+    """
+
+    def __init__(self, screen):
+        self._screen = screen
+        self._runs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.submit()
+
+    def __len__(self):
+        return sum(len(commands) for kind, commands in self._runs)
+
+    def _add(self, kind, command):
+        runs = self._runs
+        if runs and runs[-1][0] == kind:
+            runs[-1][1].append(command)
+        else:
+            runs.append((kind, [command]))
+
+    def line(self, start, end, color):
+        """Record a line from start to end."""
+        camera = self._screen.camera
+        if camera.active:
+            line = camera._line(start, end)
+            if line is None:
+                return
+            start, end, width = line
+        else:
+            start = round_pos(start)
+            end = round_pos(end)
+            width = 1
+        self._add('draw', (
+            pygame.draw.line, make_color(color), start, end, width
+        ))
+
+    def _circle(self, pos, radius, color, filled):
+        camera = self._screen.camera
+        if camera.active:
+            circle = camera._circle(pos, radius)
+            if circle is None:
+                return
+            pos, radius, width = circle
+        else:
+            pos = round_pos(pos)
+            width = 1
+        self._add('draw', (
+            pygame.draw.circle, make_color(color), pos, radius,
+            0 if filled else width
+        ))
+
+    def circle(self, pos, radius, color):
+        """Record a circle."""
+        self._circle(pos, radius, color, False)
+
+    def filled_circle(self, pos, radius, color):
+        """Record a filled circle."""
+        self._circle(pos, radius, color, True)
+
+    def rect(self, rect, color):
+        """Record a rectangle."""
+        if not isinstance(rect, RECT_CLASSES):
+            raise TypeError("batch.rect() requires a rect to draw")
+        width = 1
+        camera = self._screen.camera
+        if camera.active:
+            transformed = camera._rect(rect)
+            if transformed is None:
+                return
+            rect, width = transformed
+        self._add('draw', (pygame.draw.rect, make_color(color), rect, width))
+
+    def filled_rect(self, rect, color):
+        """Record a filled rectangle."""
+        if not isinstance(rect, RECT_CLASSES):
+            raise TypeError("batch.filled_rect() requires a rect to draw")
+        camera = self._screen.camera
+        if camera.active:
+            transformed = camera._rect(rect)
+            if transformed is None:
+                return
+            rect = transformed[0]
+        self._add('fill', (make_color(color), rect))
+
+    def blit(self, image, pos):
+        """Record a sprite to draw, as for :meth:`Screen.blit`."""
+        if isinstance(image, str):
+            image = loaders.images.load(image)
+        camera = self._screen.camera
+        if camera.active:
+            blit = camera._blit(image, pos)
+            if blit is None:
+                return
+            self._add('blit', blit)
+        else:
+            self._add('blit', (image, pos))
+
+    def clear(self):
+        """Discard all recorded commands."""
+        self._runs = []
+
+    def submit(self):
+        """Draw all recorded commands onto the screen, and clear the batch."""
+        screen = self._screen
+        surf = screen.surface
+        track = screen._dirty is not None
+        for kind, commands in self._runs:
+            if kind == 'blit':
+                if track:
+                    screen._dirty.extend(surf.blits(commands))
+                else:
+                    surf.blits(commands, doreturn=False)
+            elif kind == 'fill':
+                fill = surf.fill
+                for color, rect in commands:
+                    r = fill(color, rect)
+                    if track:
+                        screen._dirty.append(r)
+            else:
+                for func, *args in commands:
+                    r = func(surf, *args)
+                    if track:
+                        screen._dirty.append(r)
+        self._runs = []
+
+
+class Layer:
+    """One layer of a :class:`Compositor`; create these with its add()."""
+
+    def __init__(self, compositor, name, draw, z, static, size, pos, scroll,
+                 opaque, clip):
+        self._compositor = compositor
+        self.name = name
+        self.draw = draw
+        self._z = z
+        self.static = static
+        self.size = size
+        self.pos = pos
+        self.scroll = scroll
+        self.opaque = opaque
+        self.clip = clip
+        #: Hidden layers are skipped when compositing
+        self.visible = True
+        self._surface = None
+        self._target = None
+        self._valid = False
+
+    def __repr__(self):
+        return '<Layer %r z=%r%s>' % (
+            self.name, self._z, ' static' if self.static else ''
+        )
+
+    @property
+    def z(self):
+        """The layer's depth; layers with a higher z are drawn on top."""
+        return self._z
+
+    @z.setter
+    def z(self, z):
+        self._z = z
+        self._compositor._order = None
+
+    def invalidate(self):
+        """Redraw this static layer the next time the compositor draws."""
+        self._valid = False
+        self._compositor._request_redraw()
+
+    def _composite(self, screen, args):
+        if self.clip is None:
+            self._draw_onto(screen, args)
+            return
+        surface = screen.surface
+        previous = surface.get_clip()
+        surface.set_clip(previous.clip(self.clip))
+        try:
+            self._draw_onto(screen, args)
+        finally:
+            surface.set_clip(previous)
+
+    def _draw_onto(self, screen, args):
+        if not self.static:
+            if self.scroll:
+                self.draw(screen, *args)
+            else:
+                with screen.camera.suspended():
+                    self.draw(screen, *args)
+            return
+
+        size = self.size or (screen.width, screen.height)
+        if self._surface is None or self._surface.get_size() != size:
+            if self.opaque:
+                self._surface = pygame.Surface(size).convert(screen.surface)
+            else:
+                self._surface = pygame.Surface(size, pygame.SRCALPHA)
+            self._target = Screen(self._surface)
+            self._valid = False
+        if not self._valid:
+            if not self.opaque:
+                self._surface.fill((0, 0, 0, 0))
+            self.draw(self._target, *args)
+            screen.camera.forget(self._surface)
+            self._valid = True
+
+        if self.scroll:
+            screen.blit(self._surface, self.pos)
+        else:
+            with screen.camera.suspended():
+                screen.blit(self._surface, self.pos)
+
+
+class Compositor:
+    """Draw a scene as a stack of layers, caching those that rarely change.
+
+    Each layer has a draw function, which is called with a :class:`Screen`
+    to draw on, followed by any extra arguments given to :meth:`draw`.
+
+    A dynamic layer's function draws straight onto the screen, every frame.
+    A static layer's function draws onto a cached surface instead; it is
+    only called again after the layer is invalidated, and until then
+    compositing the layer costs a single blit. For example::
+
+        layers = Compositor()
+        layers.add('map', draw_map, z=0, static=True)
+        layers.add('sprites', draw_sprites, z=1)
+        hud = layers.add('hud', draw_hud, z=2, static=True, scroll=False)
+
+        def draw():
+            layers.draw(screen)
+
+        def on_score_changed():
+            hud.invalidate()
+
+    Layers are drawn in order of increasing z, and in the order they were
+    added when their z is the same.
+
+    """
+
+    def __init__(self):
+        self._layers = {}
+        self._order = None
+        self._screen = None
+
+    def add(self, name, draw, z=0, static=False, size=None, pos=(0, 0),
+            scroll=True, opaque=False, clip=None):
+        """Add a layer and return it.
+
+        :param name: A name to look the layer up by, as ``compositor[name]``.
+        :param draw: The function that draws the layer.
+        :param z: The layer's depth; higher layers are drawn on top.
+        :param static: If True, cache the layer until it is invalidated.
+        :param size: The size of a static layer's cached surface. Defaults
+                     to the size of the screen; a scrolling layer may need
+                     to cover the whole world instead.
+        :param pos: Where to place a static layer's cached surface.
+        :param scroll: If False, draw the layer in screen coordinates,
+                       ignoring the screen's camera; use this for a HUD.
+        :param opaque: If True, a static layer covers its whole surface,
+                       which can then be drawn without per-pixel alpha.
+        :param clip: A rect, in screen coordinates, that limits where the
+                     layer may draw; for example, the part of the window
+                     that shows the world, leaving out a HUD.
+
+        """
+        if name in self._layers:
+            raise ValueError("There is already a layer named %r" % name)
+        layer = Layer(
+            self, name, draw, z, static, size, pos, scroll, opaque, clip
+        )
+        self._layers[name] = layer
+        self._order = None
+        return layer
+
+    def remove(self, name):
+        """Remove the named layer."""
+        del self._layers[name]
+        self._order = None
+
+    def __getitem__(self, name):
+        return self._layers[name]
+
+    def __contains__(self, name):
+        return name in self._layers
+
+    def __len__(self):
+        return len(self._layers)
+
+    def __iter__(self):
+        """Iterate over the layers, from the bottom up."""
+        if self._order is None:
+            # sorted() is stable, so layers with equal z keep their order
+            self._order = sorted(
+                self._layers.values(), key=lambda layer: layer.z
+            )
+        return iter(self._order)
+
+    def invalidate(self):
+        """Redraw every static layer the next time the compositor draws."""
+        for layer in self._layers.values():
+            layer._valid = False
+        self._request_redraw()
+
+    def _request_redraw(self):
+        if self._screen is not None:
+            self._screen.invalidate()
+
+    def draw(self, screen, *args):
+        """Draw all visible layers onto screen.
+
+        Any further arguments are passed on to the layers' draw functions.
+
+        """
+        self._screen = screen
+        for layer in self:
+            if layer.visible:
+                layer._composite(screen, args)
+
+
+class Screen:
+    """Interface to the screen."""
+    def __init__(self, surface):
+        self.surface = surface
+        self.width, self.height = surface.get_size()
+        self._dirty = None
+        self._invalidated = False
+        self._painter = SurfacePainter(self)
+        self.camera = Camera(self)
+
+    def invalidate(self):
+        """Request that draw() is called for the next frame.
+
+        This is only needed in games that set ``REDRAW_ON_DEMAND = True``;
+        those only redraw after input, screen changes, clock events or a call
+        to this method.
+
+        """
+        self._invalidated = True
+
+    def _take_invalidated(self):
+        """Return whether a redraw was requested, and reset the request."""
+        invalidated = self._invalidated
+        self._invalidated = False
+        return invalidated
+
+    def _track_dirty(self, enabled=True):
+        """Start or stop recording the regions touched by drawing operations.
+
+        This is used by the game loop to present only the changed parts of
+        the window (see ``DIRTY_RECTS`` in :mod:`pgzero.game`).
+
+        """
+        self._dirty = [] if enabled else None
+
+    def _mark_dirty(self, rect):
+        """Record that rect has been drawn to, if we are tracking changes."""
+        if self._dirty is not None:
+            self._dirty.append(rect)
+
+    def _take_dirty(self):
+        """Return the regions drawn since the last call, and reset them.
+
+        Return None if dirty tracking is not enabled.
+
+        """
+        dirty = self._dirty
+        if dirty is not None:
+            self._dirty = []
+        return dirty
+
+    def clear(self):
+        """Clear the screen to black."""
+        self.fill((0, 0, 0))
+
+    def fill(self, color):
+        """Fill the screen with a colour."""
+        self._mark_dirty(self.surface.fill(make_color(color)))
+
+    def blit(self, image, pos):
+        """Draw a sprite onto the screen.
+
+        "blit" is an archaic name for this operation, but one that is is still
+        frequently used, for example in Pygame. See the `Wikipedia article`__
+        for more about the etymology of the term.
+
+        .. __: http://en.wikipedia.org/wiki/Bit_blit
+
+        :param image: A Surface or the name of an image object to load.
+        :param pos: The coordinates at which the top-left corner of the sprite
+                    will be positioned, in world coordinates (see
+                    :class:`Camera`). This may be given as a pair of
+                    coordinates or as a Rect. If a Rect is given the sprite
+                    will be drawn at ``rect.topleft``.
+
+        """
+        if isinstance(image, str):
+            image = loaders.images.load(image)
+        camera = self.camera
+        if camera.active:
+            blit = camera._blit(image, pos)
+            if blit is None:
+                return
+            image, pos = blit
+        self._mark_dirty(self.surface.blit(image, pos))
+
+    def blit_many(self, blits):
+        """Draw many sprites onto the screen with a single call.
+
+        This is much faster than calling :meth:`blit` in a loop, for example
+        to draw the tiles of a map::
+
+            screen.blit_many((tile_images[t], pos) for t, pos in tiles)
+
+        :param blits: An iterable of ``(image, pos)`` pairs, with each image
+                      and pos as for :meth:`blit`. Each distinct image name
+                      is only looked up once.
+
+        """
+        load = loaders.images.load
+        loaded = {}
+        items = []
+        append = items.append
+        for image, pos in blits:
+            if isinstance(image, str):
+                if image not in loaded:
+                    loaded[image] = load(image)
+                image = loaded[image]
+            append((image, pos))
+
+        camera = self.camera
+        if camera.active:
+            items = [
+                blit for blit in (camera._blit(*item) for item in items)
+                if blit is not None
+            ]
+        if self._dirty is None:
+            self.surface.blits(items, doreturn=False)
+        else:
+            self._dirty.extend(self.surface.blits(items))
+
+    def batch(self):
+        """Return a new :class:`DrawBatch` for drawing onto the screen."""
+        return DrawBatch(self)
+
+    @property
+    def draw(self):
+        return self._painter
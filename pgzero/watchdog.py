@@ -0,0 +1,162 @@
+"""A watchdog that reports which code makes frames take too long.
+
+The game loop arms the watchdog at the start of each frame and disarms it at
+the end. If a frame runs past its budget, a background thread samples the
+main thread's stack until the frame finishes. Each such hitch is then written
+to a log file, with its duration and the stacks seen in each phase of the
+frame. When the watchdog is stopped, a summary of the stacks seen across all
+hitches is appended.
+
+Enable it by setting ``HITCH_BUDGET`` (in seconds) in the game module, and
+optionally ``HITCH_LOG`` to choose the log file.
+
+"""
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+
+__all__ = ['HitchWatchdog']
+
+
+def sample_stack(frame, limit=None):
+    """Return the stack of frame as a tuple of "file:line in func" strings.
+
+    The innermost call comes last.
+
+    """
+    return tuple(
+        '%s:%d in %s' % (f.filename, f.lineno, f.name)
+        for f in traceback.extract_stack(frame, limit)
+    )
+
+
+class HitchWatchdog:
+    """Sample the main thread's stack during frames that overrun a budget.
+
+    :param budget: How many seconds a frame may take before it is a hitch.
+    :param path: The file to append hitch reports to.
+    :param interval: How often to sample the stack during a hitch, in
+                     seconds. Defaults to a quarter of the budget.
+    :param limit: The maximum number of stack entries to keep per sample.
+
+    """
+
+    def __init__(self, budget=0.1, path='hitches.log', interval=None,
+                 limit=20):
+        self.budget = budget
+        self.path = path
+        self.interval = interval or budget / 4
+        self.limit = limit
+
+        #: The phase of the frame that is running, set by the game loop
+        self.phase = None
+        #: How many hitches have been seen
+        self.hitches = 0
+        #: Samples from all hitches, counted by (phase, stack)
+        self.totals = Counter()
+
+        self._lock = threading.Lock()
+        self._frame = 0
+        self._start = None
+        self._samples = []
+        self._reports = []
+        self._stopping = threading.Event()
+        self._thread = None
+        self._main = threading.main_thread().ident
+
+    def start(self):
+        """Start the sampling thread."""
+        self._main = threading.get_ident()
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='pgzero-watchdog', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the sampling thread and write the summary to the log."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+        self._write_reports()
+        if self.hitches:
+            with open(self.path, 'a') as f:
+                self._write_summary(f)
+
+    def arm(self, phase='events'):
+        """Mark the start of a frame."""
+        with self._lock:
+            self._frame += 1
+            self._samples = []
+            self.phase = phase
+            self._start = time.perf_counter()
+
+    def disarm(self):
+        """Mark the end of a frame, queueing a report if it overran.
+
+        :return: The duration of the frame in seconds.
+
+        """
+        end = time.perf_counter()
+        with self._lock:
+            duration = end - self._start
+            self._start = None
+            if duration > self.budget:
+                self.hitches += 1
+                self._reports.append((self._frame, duration, self._samples))
+        return duration
+
+    def _run(self):
+        # Reports are written here rather than in disarm(), so that file
+        # I/O never adds to the frame time of the main thread
+        while not self._stopping.wait(self.interval):
+            start = self._start
+            if start is not None and \
+                    time.perf_counter() - start > self.budget:
+                self._sample(self._frame)
+            if self._reports:
+                self._write_reports()
+
+    def _sample(self, frame_number):
+        with self._lock:
+            if frame_number != self._frame or self._start is None:
+                return
+            frame = sys._current_frames().get(self._main)
+            if frame is None:
+                return
+            self._samples.append((self.phase, sample_stack(frame, self.limit)))
+
+    def _write_reports(self):
+        with self._lock:
+            reports, self._reports = self._reports, []
+        if not reports:
+            return
+        with open(self.path, 'a') as f:
+            for frame_number, duration, samples in reports:
+                counts = Counter(samples)
+                self.totals.update(counts)
+                f.write('hitch: frame %d took %.1f ms\n' % (
+                    frame_number, duration * 1000
+                ))
+                if not counts:
+                    f.write('    (finished before it could be sampled)\n')
+                self._write_stacks(f, counts)
+                f.write('\n')
+
+    def _write_summary(self, f):
+        f.write('summary: %d hitches, %d samples\n' % (
+            self.hitches, sum(self.totals.values())
+        ))
+        self._write_stacks(f, self.totals)
+        f.write('\n')
+
+    @staticmethod
+    def _write_stacks(f, counts):
+        for (phase, stack), count in counts.most_common():
+            f.write('    %d sample(s) in %s:\n' % (count, phase))
+            for entry in stack:
+                f.write('        %s\n' % entry)